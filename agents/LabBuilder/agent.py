@@ -3,11 +3,34 @@ LabBuilder Agent
 Model: models/gemini-2.5-pro
 """
 
-import json
 from pathlib import Path
 from typing import Dict, Any
 
-from ..base_agent import BaseAgent, GenerationConfig
+from ..base_agent import BaseAgent, vertex_generation_config, dumps_compact
+
+
+# Generation configs are built once and shared by all instances (the
+# vertex one becomes a GenerationConfig on first use; see base_agent)
+_GEN_CFG_CLAUDE = {
+    "temperature": 0.3,
+    "max_tokens": 16000,
+    "cli_timeout": 900,  # LabBuilder generates full codebases — needs more time
+}
+_GEN_CFG_VERTEX = {
+    "temperature": 0.3,
+    "top_p": 0.9,
+    "top_k": 30,
+    "max_output_tokens": 65536,
+    "candidate_count": 1,
+    "response_mime_type": "application/json",
+}
+_GEN_CFG_GEMINI = {
+    "temperature": 0.3,
+    "top_p": 0.9,
+    "top_k": 30,
+    "max_output_tokens": 65536,
+    "response_mime_type": "application/json",
+}
 
 
 class LabBuilderAgent(BaseAgent):
@@ -16,6 +39,11 @@ class LabBuilderAgent(BaseAgent):
     Model: models/gemini-2.5-pro
     """
 
+    PROMPT_PATH = Path(__file__).parent / "prompt.md"
+
+    # Outputs run up to 65k tokens; stream them instead of waiting idle
+    STREAM_OUTPUT = True
+
     def __init__(
             self,
             api_key: str | None = None,
@@ -23,36 +51,20 @@ class LabBuilderAgent(BaseAgent):
             model: str | None = None):
         # Use default claude-opus-4-8 if not specified
         model = model or "claude-opus-4-8"
-        prompt_path = Path(__file__).parent / "prompt.md"
         super().__init__(
             api_key,
             model=model,
-            prompt_file_path=prompt_path,
+            prompt_file_path=self.PROMPT_PATH,
             provider=provider)
 
         # Override generation config for LabBuilder - needs higher token limit
         # for complete labs
         if self.provider in ("claude", "claude-code"):
-            self.generation_config = {
-                "temperature": 0.3,
-                "max_tokens": 16000,
-                "cli_timeout": 900,  # LabBuilder generates full codebases — needs more time
-            }
-        elif self.provider == "vertex" and GenerationConfig is not None:
-            self.generation_config = GenerationConfig(
-                temperature=0.3,
-                top_p=0.9,
-                top_k=30,
-                max_output_tokens=65536,
-                candidate_count=1,
-            )
+            self.generation_config = _GEN_CFG_CLAUDE
+        elif self.provider == "vertex":
+            self.generation_config = vertex_generation_config(_GEN_CFG_VERTEX)
         else:  # gemini — always use plain dict
-            self.generation_config = {
-                "temperature": 0.3,
-                "top_p": 0.9,
-                "top_k": 30,
-                "max_output_tokens": 65536,
-            }
+            self.generation_config = _GEN_CFG_GEMINI
 
     async def build(self, plan_data: Dict[str, Any]) -> Dict[str, Any]:
         """Build complete runnable lab from plan
@@ -61,7 +73,7 @@ class LabBuilderAgent(BaseAgent):
         User prompt contains only the plan data JSON.
         """
         # Pass only the plan data - prompt.md has all instructions
-        prompt = json.dumps(plan_data, indent=2)
+        prompt = dumps_compact(plan_data)
 
         try:
             return await self.generate_json(prompt, retries=3)
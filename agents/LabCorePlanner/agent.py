@@ -3,11 +3,34 @@ LabCorePlanner Agent
 Model: models/gemini-2.5-pro
 """
 
-import json
+import asyncio
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List
 
-from ..base_agent import BaseAgent, GenerationConfig
+from ..base_agent import BaseAgent, vertex_generation_config, dumps_compact
+
+
+# Generation configs are built once and shared by all instances (the
+# vertex one becomes a GenerationConfig on first use; see base_agent)
+_GEN_CFG_CLAUDE = {
+    "temperature": 0.5,
+    "max_tokens": 16384,
+    "cli_timeout": 600,
+}
+_GEN_CFG_VERTEX = {
+    "temperature": 0.5,
+    "top_p": 0.92,
+    "top_k": 40,
+    "max_output_tokens": 16384,
+    "response_mime_type": "application/json",
+}
+_GEN_CFG_GEMINI = {
+    "temperature": 0.5,
+    "top_p": 0.92,
+    "top_k": 40,
+    "max_output_tokens": 16384,
+    "response_mime_type": "application/json",
+}
 
 
 class LabCorePlannerAgent(BaseAgent):
@@ -16,6 +39,8 @@ class LabCorePlannerAgent(BaseAgent):
     Model: models/gemini-2.5-pro
     """
 
+    PROMPT_PATH = Path(__file__).parent / "prompt.md"
+
     def __init__(
             self,
             api_key: str | None = None,
@@ -23,34 +48,19 @@ class LabCorePlannerAgent(BaseAgent):
             model: str | None = None):
         # Use default claude-opus-4-8 if not specified
         model = model or "claude-opus-4-8"
-        prompt_path = Path(__file__).parent / "prompt.md"
         super().__init__(
             api_key,
             model=model,
-            prompt_file_path=prompt_path,
+            prompt_file_path=self.PROMPT_PATH,
             provider=provider)
 
         # Optimized config for structured lab planning
         if self.provider in ("claude", "claude-code"):
-            self.generation_config = {
-                "temperature": 0.5,
-                "max_tokens": 16384,
-                "cli_timeout": 600,
-            }
-        elif self.provider == "vertex" and GenerationConfig is not None:
-            self.generation_config = GenerationConfig(
-                temperature=0.5,
-                top_p=0.92,
-                top_k=40,
-                max_output_tokens=16384,
-            )
+            self.generation_config = _GEN_CFG_CLAUDE
+        elif self.provider == "vertex":
+            self.generation_config = vertex_generation_config(_GEN_CFG_VERTEX)
         else:  # gemini — always use plain dict
-            self.generation_config = {
-                "temperature": 0.5,
-                "top_p": 0.92,
-                "top_k": 40,
-                "max_output_tokens": 16384,
-            }
+            self.generation_config = _GEN_CFG_GEMINI
 
     async def plan(self, vulnerability_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create lab plan from vulnerability data
@@ -58,8 +68,7 @@ class LabCorePlannerAgent(BaseAgent):
         System instruction from prompt.md contains all instructions.
         User prompt contains only the vulnerability data JSON.
         """
-        # Pass only the vulnerability data - prompt.md has all instructions
-        prompt = json.dumps(vulnerability_data, indent=2)
+        prompt = self._build_prompt(vulnerability_data)
 
         try:
             return await self.generate_json(prompt, retries=3)
@@ -69,3 +78,25 @@ class LabCorePlannerAgent(BaseAgent):
                 "error": True,
                 "reason": f"Agent processing failed: {str(e)}"
             }
+
+    async def plan_many(
+            self,
+            vulnerability_items: List[Dict[str, Any]],
+            batch: bool = False) -> List[Dict[str, Any]]:
+        """Create lab plans for several vulnerabilities
+
+        With batch=True (gemini + google-genai only) all items go through the
+        Gemini Batch API in one job; otherwise they run as concurrent plan()
+        calls.
+        """
+        if batch and self.supports_batch():
+            prompts = [self._build_prompt(item) for item in vulnerability_items]
+            return await self.submit_batch(prompts)
+        return list(await asyncio.gather(
+            *(self.plan(item) for item in vulnerability_items)))
+
+    @staticmethod
+    def _build_prompt(vulnerability_data: Dict[str, Any]) -> str:
+        """Build the user prompt for one vulnerability"""
+        # Pass only the vulnerability data - prompt.md has all instructions
+        return dumps_compact(vulnerability_data)
@@ -3,13 +3,39 @@ WriteUpToMarkdown Agent - Converts write-up URLs to markdown using Jina.ai
 Model: gemini-2.5-flash
 """
 
-from datetime import datetime
+import asyncio
+import weakref
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any
+from typing import AsyncIterator, Dict, Any, List, Optional
 
 import httpx
 
-from ..base_agent import BaseAgent, GenerationConfig
+from ..base_agent import BaseAgent, vertex_generation_config, MAX_MARKDOWN_CHARS
+
+
+_UTC = timezone.utc
+
+# Generation configs are built once and shared by all instances (the
+# vertex one becomes a GenerationConfig on first use; see base_agent)
+_GEN_CFG_CLAUDE = {
+    "temperature": 0.4,
+    "max_tokens": 15000,
+}
+_GEN_CFG_VERTEX = {
+    "temperature": 0.4,
+    "top_p": 0.9,
+    "top_k": 40,
+    "max_output_tokens": 15000,
+    "response_mime_type": "application/json",
+}
+_GEN_CFG_GEMINI = {
+    "temperature": 0.4,
+    "top_p": 0.9,
+    "top_k": 40,
+    "max_output_tokens": 15000,
+    "response_mime_type": "application/json",
+}
 
 
 class WriteUpToMarkdownAgent(BaseAgent):
@@ -17,6 +43,36 @@ class WriteUpToMarkdownAgent(BaseAgent):
     WriteUpToMarkdown Agent - Converts write-up URLs to markdown using Jina.ai
     """
 
+    PROMPT_PATH = Path(__file__).parent / "prompt.md"
+
+    # Bytes read before validation; enough for MAX_MARKDOWN_CHARS of UTF-8
+    PREFIX_BYTES = MAX_MARKDOWN_CHARS * 4
+
+    # One client per event loop, shared by every instance on that loop so
+    # repeated fetches reuse pooled connections (which are tied to the loop)
+    _clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    @classmethod
+    async def get_client(cls) -> httpx.AsyncClient:
+        """Return the running loop's Jina.ai HTTP client, creating it on first use"""
+        loop = asyncio.get_running_loop()
+        client = cls._clients.get(loop)
+        if client is None or client.is_closed:
+            client = cls._clients[loop] = httpx.AsyncClient(
+                timeout=60.0,
+                limits=httpx.Limits(
+                    max_connections=1000,
+                    max_keepalive_connections=100),
+            )
+        return client
+
+    @classmethod
+    async def aclose_client(cls):
+        """Close the running loop's HTTP client (call before the loop exits)"""
+        client = cls._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
     def __init__(
             self,
             api_key: str | None = None,
@@ -24,58 +80,75 @@ class WriteUpToMarkdownAgent(BaseAgent):
             model: str | None = None):
         # Use default claude-haiku-4-5 because this is a lightweight task
         model = model or "claude-haiku-4-5"
-        prompt_path = Path(__file__).parent / "prompt.md"
         super().__init__(
             api_key,
             model=model,
-            prompt_file_path=prompt_path,
+            prompt_file_path=self.PROMPT_PATH,
             provider=provider)
 
         # Override generation config - lower temperature for consistent
         # validation decisions
         if self.provider in ("claude", "claude-code"):
-            self.generation_config = {
-                "temperature": 0.4,
-                "max_tokens": 15000,
-            }
-        elif self.provider == "vertex" and GenerationConfig is not None:
-            self.generation_config = GenerationConfig(
-                temperature=0.4,
-                top_p=0.9,
-                top_k=40,
-                max_output_tokens=15000,
-            )
+            self.generation_config = _GEN_CFG_CLAUDE
+        elif self.provider == "vertex":
+            self.generation_config = vertex_generation_config(_GEN_CFG_VERTEX)
         else:  # gemini — always use plain dict
-            self.generation_config = {
-                "temperature": 0.4,
-                "top_p": 0.9,
-                "top_k": 40,
-                "max_output_tokens": 15000,
-            }
+            self.generation_config = _GEN_CFG_GEMINI
+
+    @staticmethod
+    async def _read_body(
+            body: AsyncIterator[bytes],
+            chunks: List[bytes],
+            limit: Optional[int] = None) -> bool:
+        """Append body chunks to chunks, stopping once limit bytes are held.
+
+        Returns:
+            True if the body was read to the end, False if it stopped early
+        """
+        size = sum(map(len, chunks))
+        async for chunk in body:
+            chunks.append(chunk)
+            size += len(chunk)
+            if limit is not None and size >= limit:
+                return False
+        return True
 
     async def convert(self, url: str) -> Dict[str, Any]:
         """Convert write-up URL to structured markdown"""
         jina_url = f"https://r.jina.ai/{url}"
 
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.get(jina_url)
+            client = await self.get_client()
+            async with client.stream("GET", jina_url) as response:
                 response.raise_for_status()
-                markdown_content = response.text
+                return await self._convert_response(url, response)
         except Exception:
             return {
                 "error": True,
                 "status": "error"
             }
 
-        # The system instruction from prompt.txt is already loaded
-        # Pass the actual data as the user prompt
-        prompt = (
-            f"Analyze this URL and determine if it's a vulnerability "
-            f"write-up or security blog post.\n\n"
-            f"URL: {url}\n\n"
-            f"Markdown content:\n{markdown_content[:8000]}\n"
-        )
+    async def _convert_response(
+            self, url: str, response: httpx.Response) -> Dict[str, Any]:
+        """Validate a streamed Jina.ai page; read the rest only if accepted"""
+        # The stream stays open during validation, so an accepted page
+        # carries on from PREFIX_BYTES instead of being downloaded again
+        body = response.aiter_bytes()
+        chunks: List[bytes] = []
+        complete = await self._read_body(body, chunks, self.PREFIX_BYTES)
+        encoding = response.encoding or "utf-8"
+        # errors="ignore" drops a multi-byte character split at the cut
+        markdown_content = b"".join(chunks).decode(encoding, errors="ignore")
+
+        # The system instruction from prompt.md is already loaded
+        # Pass the actual data as the user prompt: fixed framing first and
+        # the per-request URL last, so repeated prefixes hit implicit caching
+        prompt = "".join((
+            "Analyze this page and determine if it's a vulnerability "
+            "write-up or security blog post.\n\n"
+            "Markdown content:\n", markdown_content[:MAX_MARKDOWN_CHARS], "\n\n"
+            "URL: ", url, "\n",
+        ))
 
         try:
             result = await self.generate_json(prompt, retries=3)
@@ -84,10 +157,23 @@ class WriteUpToMarkdownAgent(BaseAgent):
             if "input" not in result:
                 result["input"] = {}
             result["input"]["url"] = url
-            result["input"]["fetch_time"] = datetime.utcnow().isoformat() + "Z"
+            result["input"]["fetch_time"] = (
+                datetime.now(_UTC).isoformat(timespec="seconds")
+                .replace("+00:00", "Z"))
 
-            # Store full markdown if successful
+            # Store full markdown if successful (reading the rest of the
+            # body only when validation passed on a truncated read)
             if result.get("status") == "ok":
+                if not complete:
+                    try:
+                        await self._read_body(body, chunks)
+                        markdown_content = b"".join(chunks).decode(
+                            encoding, errors="replace")
+                    except Exception as e:
+                        # Keep the validated prefix rather than fail the step
+                        self._log_error(
+                            f"Reading the full page failed, keeping truncated "
+                            f"markdown: {str(e)}")
                 result["markdown"] = markdown_content
 
             return result
@@ -98,7 +184,7 @@ class WriteUpToMarkdownAgent(BaseAgent):
                 "error": True,
                 "reason": (
                     f"Agent processing failed: {error_msg}. "
-                    f"Check logs/agent_errors/ for details."
+                    f"Check logs/agent_errors.log for details."
                 ),
                 "status": "error"
             }
@@ -2,10 +2,33 @@
 WriteupParser (Vulnerability Information Builder) Agent
 """
 
+import asyncio
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List
 
-from ..base_agent import BaseAgent, GenerationConfig
+from ..base_agent import BaseAgent, vertex_generation_config, MAX_MARKDOWN_CHARS
+
+
+# Generation configs are built once and shared by all instances (the
+# vertex one becomes a GenerationConfig on first use; see base_agent)
+_GEN_CFG_CLAUDE = {
+    "temperature": 0.2,
+    "max_tokens": 8192,
+}
+_GEN_CFG_VERTEX = {
+    "temperature": 0.2,
+    "top_p": 0.9,
+    "top_k": 20,
+    "max_output_tokens": 8192,
+    "response_mime_type": "application/json",
+}
+_GEN_CFG_GEMINI = {
+    "temperature": 0.2,
+    "top_p": 0.9,
+    "top_k": 20,
+    "max_output_tokens": 8192,
+    "response_mime_type": "application/json",
+}
 
 
 class WriteupParserAgent(BaseAgent):
@@ -13,6 +36,8 @@ class WriteupParserAgent(BaseAgent):
     WriteupParser (Vulnerability Information Builder) Agent
     """
 
+    PROMPT_PATH = Path(__file__).parent / "prompt.md"
+
     def __init__(
             self,
             api_key: str | None = None,
@@ -20,33 +45,19 @@ class WriteupParserAgent(BaseAgent):
             model: str | None = None):
         # Use default claude-opus-4-8 if not specified
         model = model or "claude-opus-4-8"
-        prompt_path = Path(__file__).parent / "prompt.md"
         super().__init__(
             api_key,
             model=model,
-            prompt_file_path=prompt_path,
+            prompt_file_path=self.PROMPT_PATH,
             provider=provider)
 
         # Optimized config for precise information extraction
         if self.provider in ("claude", "claude-code"):
-            self.generation_config = {
-                "temperature": 0.2,
-                "max_tokens": 8192,
-            }
-        elif self.provider == "vertex" and GenerationConfig is not None:
-            self.generation_config = GenerationConfig(
-                temperature=0.2,
-                top_p=0.9,
-                top_k=20,
-                max_output_tokens=8192,
-            )
+            self.generation_config = _GEN_CFG_CLAUDE
+        elif self.provider == "vertex":
+            self.generation_config = vertex_generation_config(_GEN_CFG_VERTEX)
         else:  # gemini — always use plain dict
-            self.generation_config = {
-                "temperature": 0.2,
-                "top_p": 0.9,
-                "top_k": 20,
-                "max_output_tokens": 8192,
-            }
+            self.generation_config = _GEN_CFG_GEMINI
 
     async def parse(self, markdown_data: Dict[str, Any]) -> Dict[str, Any]:
         """Parse vulnerability information from markdown
@@ -54,10 +65,7 @@ class WriteupParserAgent(BaseAgent):
         System instruction from prompt.md contains all instructions.
         User prompt contains only the markdown content.
         """
-        markdown_content = markdown_data.get("markdown", "")
-
-        # Pass only the markdown content - prompt.md has all instructions
-        prompt = markdown_content[:8000]
+        prompt = self._build_prompt(markdown_data)
 
         try:
             return await self.generate_json(prompt, retries=3)
@@ -67,3 +75,27 @@ class WriteupParserAgent(BaseAgent):
                 "error": True,
                 "reason": f"Agent processing failed: {str(e)}"
             }
+
+    async def parse_many(
+            self,
+            markdown_items: List[Dict[str, Any]],
+            batch: bool = False) -> List[Dict[str, Any]]:
+        """Parse several write-ups
+
+        With batch=True (gemini + google-genai only) all items go through the
+        Gemini Batch API in one job; otherwise they run as concurrent
+        parse() calls.
+        """
+        if batch and self.supports_batch():
+            prompts = [self._build_prompt(item) for item in markdown_items]
+            return await self.submit_batch(prompts)
+        return list(await asyncio.gather(
+            *(self.parse(item) for item in markdown_items)))
+
+    @staticmethod
+    def _build_prompt(markdown_data: Dict[str, Any]) -> str:
+        """Build the user prompt for one write-up"""
+        markdown_content = markdown_data.get("markdown", "")
+
+        # Pass only the markdown content - prompt.md has all instructions
+        return markdown_content[:MAX_MARKDOWN_CHARS]
@@ -9,6 +9,7 @@ from .WriteUpToMarkdown.agent import WriteUpToMarkdownAgent
 from .WriteupParser.agent import WriteupParserAgent
 from .LabCorePlanner.agent import LabCorePlannerAgent
 from .LabBuilder.agent import LabBuilderAgent
+from .pipeline import run_pipeline_batch, stage_failed
 
 __all__ = [
     'BaseAgent',
@@ -16,4 +17,6 @@ __all__ = [
     'WriteupParserAgent',
     'LabCorePlannerAgent',
     'LabBuilderAgent',
+    'run_pipeline_batch',
+    'stage_failed',
 ]
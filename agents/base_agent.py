@@ -10,45 +10,293 @@ Backends supported:
 """
 
 import asyncio
+import atexit
+import copy
+import functools
+import hashlib
 import json
+import logging
+import queue
 import re
 import os
 import shutil
 import subprocess
+import tempfile
+import threading
 import warnings
-from datetime import datetime
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional
+
+# Provider SDKs are imported by _load_provider_sdk() when the first agent
+# for that provider is created, so one backend never pays for the others
+GenerativeModel = None  # type: ignore
+GenerationConfig = None  # type: ignore
+vertexai = None  # type: ignore
+vertex_caching = None  # type: ignore
+PreviewGenerativeModel = None  # type: ignore
+genai = None  # type: ignore
+google_genai = None  # type: ignore
+anthropic_sdk = None  # type: ignore
+_LOADED_SDKS = set()
+
+
+def _load_provider_sdk(provider: str):
+    """Import the SDK(s) used by provider into this module, once"""
+    global GenerativeModel, GenerationConfig, vertexai, vertex_caching
+    global PreviewGenerativeModel, genai, google_genai, anthropic_sdk
+    if provider in _LOADED_SDKS:
+        return
+    _LOADED_SDKS.add(provider)
+
+    if provider == "vertex":
+        try:
+            # Suppress Vertex AI deprecation warnings (deprecated June 2025,
+            # removed June 2026)
+            warnings.filterwarnings(
+                'ignore',
+                category=UserWarning,
+                module='vertexai.generative_models._generative_models')
+            from vertexai.generative_models import GenerativeModel, GenerationConfig  # type: ignore
+            import vertexai  # type: ignore
+        except Exception:  # SDK might not be installed
+            pass
+        try:
+            # Explicit context caching is only exposed through the preview
+            # namespace
+            from vertexai.preview import caching as vertex_caching  # type: ignore
+            from vertexai.preview.generative_models import GenerativeModel as PreviewGenerativeModel  # type: ignore
+        except Exception:
+            pass
+
+    elif provider == "gemini":
+        try:
+            import google.generativeai as genai  # type: ignore
+        except Exception:
+            pass
+        try:
+            # Newer google-genai SDK, only needed for the Gemini Batch API
+            from google import genai as google_genai  # type: ignore
+        except Exception:
+            pass
+
+    elif provider == "claude":
+        try:
+            import anthropic as anthropic_sdk  # type: ignore
+        except Exception:
+            pass
+
 
-# Lazy imports: we import SDKs only when used
 try:
-    # Suppress Vertex AI deprecation warnings (deprecated June 2025, removed
-    # June 2026)
-    warnings.filterwarnings(
-        'ignore',
-        category=UserWarning,
-        module='vertexai.generative_models._generative_models')
-    from vertexai.generative_models import GenerativeModel, GenerationConfig  # type: ignore
-    import vertexai  # type: ignore
-except Exception:  # SDK might not be installed if using Gemini API
-    GenerativeModel = None  # type: ignore
-    GenerationConfig = None  # type: ignore
-    vertexai = None  # type: ignore
+    import diskcache  # type: ignore
+except Exception:  # optional; the response cache stays in-memory without it
+    diskcache = None  # type: ignore
 
 try:
-    import google.generativeai as genai  # type: ignore
-except Exception:
-    genai = None  # type: ignore
+    import orjson  # type: ignore
+except Exception:  # optional speedup; stdlib json is the fallback
+    orjson = None  # type: ignore
 
 try:
-    import anthropic as anthropic_sdk  # type: ignore
-except Exception:
-    anthropic_sdk = None  # type: ignore
+    import json_repair  # type: ignore
+except Exception:  # optional; the regex repair chain is the fallback
+    json_repair = None  # type: ignore
+
+# Default generation configs, built once (agents override these)
+_DEFAULT_GEN_CFG_CLAUDE = {
+    "temperature": 0.4,
+    "max_tokens": 8192,
+}
+# Vertex needs GenerationConfig objects; see vertex_generation_config()
+_DEFAULT_GEN_CFG_VERTEX = {
+    "temperature": 0.4,
+    "top_p": 0.9,
+    "top_k": 40,
+    "max_output_tokens": 8192,
+    "candidate_count": 1,
+}
+_DEFAULT_GEN_CFG_GEMINI = {
+    "temperature": 0.4,
+    "top_p": 0.9,
+    "top_k": 40,
+    "max_output_tokens": 8192,
+}
+
+# Markdown characters passed to the LLM per write-up
+MAX_MARKDOWN_CHARS = 8000
+
+# JSON repair/extraction patterns, compiled once
+_TRAILING_COMMA_RE = re.compile(r",\s*(?=[}\]])")
+_KEY_QUOTE_RE = re.compile(r'(?m)^(\s*)([A-Za-z0-9_]+)\s*:')
+_JSON_OBJ_RE = re.compile(r"\{[\s\S]*\}")
+_JSON_ARR_RE = re.compile(r"\[[\s\S]*\]")
+
+# Explicit prompt caching (LABGENIE_PROMPT_CACHE=1, gemini/vertex only)
+PROMPT_CACHE_MIN_TOKENS = 2048
+PROMPT_CACHE_TTL = timedelta(hours=1)
+
+# Gemini Batch API polling
+BATCH_POLL_INTERVAL = 30
+_BATCH_DONE_STATES = (
+    "JOB_STATE_SUCCEEDED",
+    "JOB_STATE_FAILED",
+    "JOB_STATE_CANCELLED",
+    "JOB_STATE_EXPIRED",
+)
+
+# Blocking SDK/CLI calls (claude, claude-code) run on their own pool so they
+# never compete with other to_thread work; the semaphore caps in-flight
+# provider requests for every backend
+_LLM_WORKERS = int(os.getenv("LABGENIE_LLM_WORKERS", "32"))
+_LLM_EXECUTOR = ThreadPoolExecutor(
+    max_workers=_LLM_WORKERS, thread_name_prefix="llm")
+_LLM_CONCURRENCY = int(os.getenv("LABGENIE_LLM_CONCURRENCY", str(_LLM_WORKERS)))
+# A semaphore binds to the loop that first waits on it: keep one per loop
+_LLM_SEMAPHORES: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _llm_semaphore() -> asyncio.Semaphore:
+    """Return the in-flight request limit for the running event loop"""
+    loop = asyncio.get_running_loop()
+    semaphore = _LLM_SEMAPHORES.get(loop)
+    if semaphore is None:
+        semaphore = _LLM_SEMAPHORES[loop] = asyncio.Semaphore(_LLM_CONCURRENCY)
+    return semaphore
+
+
+# Exact-match response cache (LABGENIE_RESPONSE_CACHE=1)
+RESPONSE_CACHE_DIR = Path("cache") / "agents"
+
+
+def _response_cache_enabled() -> bool:
+    return os.getenv("LABGENIE_RESPONSE_CACHE", "0") == "1"
+
+
+def _prompt_cache_enabled() -> bool:
+    return os.getenv("LABGENIE_PROMPT_CACHE", "0") == "1"
+
+
+def _json_is_closed(text: str) -> bool:
+    """True if every string, object and array opened in text is closed"""
+    depth = 0
+    in_string = escaped = False
+    for ch in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+    return depth == 0 and not in_string
+
+
+def _is_cache_expired_error(exc: Exception) -> bool:
+    """Best-effort check for a cached content handle that expired or was deleted"""
+    msg = str(exc).lower()
+    return "cache" in msg and (
+        "not found" in msg or "expired" in msg or "404" in msg)
+
+
+_error_logger: Optional[logging.Logger] = None
+_error_logger_lock = threading.Lock()
+
+
+def _get_error_logger() -> logging.Logger:
+    """Return the agent error logger, starting its writer thread on first use.
+
+    Records are queued on the caller's thread and written to
+    logs/agent_errors.log (rotated at 10 MB) by a QueueListener, so a failing
+    LLM never blocks the event loop on disk I/O.
+    """
+    global _error_logger
+    with _error_logger_lock:
+        if _error_logger is None:
+            log_dir = Path("logs")
+            log_dir.mkdir(parents=True, exist_ok=True)
+            file_handler = RotatingFileHandler(
+                log_dir / "agent_errors.log",
+                maxBytes=10_000_000,
+                backupCount=5,
+                encoding="utf-8")
+            file_handler.setFormatter(
+                logging.Formatter("%(asctime)s | %(message)s"))
+
+            log_queue: queue.Queue = queue.Queue(-1)
+            listener = QueueListener(log_queue, file_handler)
+            listener.start()
+            atexit.register(listener.stop)
+
+            logger = logging.getLogger("labgenie.agent_errors")
+            logger.setLevel(logging.ERROR)
+            logger.propagate = False
+            logger.addHandler(QueueHandler(log_queue))
+            _error_logger = logger
+    return _error_logger
+
+
+def dumps_compact(data: Any) -> str:
+    """Serialize agent input as compact JSON (no indentation) for prompts"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def _loads(text: Any) -> Any:
+    """Parse JSON from str or bytes (orjson when installed)"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def vertex_generation_config(fields: Dict[str, Any]):
+    """Vertex GenerationConfig for fields, built once per distinct config"""
+    return _vertex_generation_config(tuple(sorted(fields.items())))
+
+
+@functools.lru_cache(maxsize=16)
+def _vertex_generation_config(items: tuple):
+    """Cached GenerationConfig keyed by sorted field items"""
+    return GenerationConfig(**dict(items))
+
+
+@functools.lru_cache(maxsize=32)
+def _read_prompt_cached(path_str: str) -> str:
+    """Read a prompt file once per process; agents share the result"""
+    return Path(path_str).read_text(encoding='utf-8')
+
+
+@functools.lru_cache(maxsize=8)
+def _anthropic_client(api_key: str):
+    """One Anthropic client (and connection pool) per API key, shared by agents"""
+    return anthropic_sdk.Anthropic(api_key=api_key)
 
 
 class BaseAgent:
     """Base class for all agents with pluggable AI backend"""
 
+    # generate_json results shared by all agents, keyed by
+    # (agent, provider, model, prompt); backed by diskcache when installed
+    _response_cache: Dict[str, Dict[str, Any]] = {}
+    _disk_cache = None
+
+    # Stream gemini/vertex responses (for very long outputs); on_progress,
+    # if set, is called with the number of characters received so far
+    STREAM_OUTPUT = False
+    on_progress: Optional[Callable[[int], None]] = None
+
     def __init__(
             self,
             api_key: Optional[str],
@@ -70,6 +318,7 @@ class BaseAgent:
                 "claude")).lower()
         if self.provider not in ("vertex", "gemini", "claude", "claude-code"):
             self.provider = "claude"
+        _load_provider_sdk(self.provider)
 
         self.model_name = model
         self.prompt_file_path = prompt_file_path
@@ -95,13 +344,8 @@ class BaseAgent:
 
             # Default Generation Config for Vertex (can be overridden by
             # subclasses)
-            self.generation_config = GenerationConfig(
-                temperature=0.4,
-                top_p=0.9,
-                top_k=40,
-                max_output_tokens=8192,
-                candidate_count=1,
-            )
+            self.generation_config = vertex_generation_config(
+                _DEFAULT_GEN_CFG_VERTEX)
 
         elif self.provider == "claude-code":
             if shutil.which("claude") is None:
@@ -109,10 +353,7 @@ class BaseAgent:
                     "Claude Code CLI not found. Install it from "
                     "https://claude.ai/download and log in with: claude login")
 
-            self.generation_config = {
-                "temperature": 0.4,
-                "max_tokens": 8192,
-            }
+            self.generation_config = _DEFAULT_GEN_CFG_CLAUDE
 
         elif self.provider == "claude":
             if anthropic_sdk is None:
@@ -125,10 +366,7 @@ class BaseAgent:
                     "Claude provider requires ANTHROPIC_API_KEY. "
                     "Set it with: export ANTHROPIC_API_KEY='your-key'")
 
-            self.generation_config = {
-                "temperature": 0.4,
-                "max_tokens": 8192,
-            }
+            self.generation_config = _DEFAULT_GEN_CFG_CLAUDE
 
         else:  # gemini API
             if genai is None:
@@ -141,14 +379,99 @@ class BaseAgent:
                     "Gemini API requires GOOGLE_API_KEY. "
                     "Set it with: export GOOGLE_API_KEY='your-key'")
             genai.configure(api_key=api_key)
+            self._gemini_api_key = api_key
 
             # Simple dict to mirror GenerationConfig fields we use
-            self.generation_config = {
-                "temperature": 0.4,
-                "top_p": 0.9,
-                "top_k": 40,
-                "max_output_tokens": 8192,
-            }
+            self.generation_config = _DEFAULT_GEN_CFG_GEMINI
+
+        # One model per agent, built lazily on first generate()
+        self._model = None
+        self._model_lock = threading.Lock()
+
+        # Upload the system instruction once so every call reuses it. The
+        # upload is a network round-trip, so _get_model does it lazily (on
+        # the LLM executor or a warmup thread), not the constructor
+        self._cache: Optional[str] = None
+        self._cache_pending = (
+            self.provider in ("vertex", "gemini") and _prompt_cache_enabled())
+
+    def _create_prompt_cache(self) -> Optional[str]:
+        """Create an explicit context cache holding the system instruction.
+
+        Returns the cache name, or None when the prompt is below the cache
+        minimum or the backend rejects it (calls then send the system
+        instruction inline as before).
+        """
+        # Rough 4 chars/token estimate; the API enforces the real minimum
+        if len(self.system_instruction) // 4 < PROMPT_CACHE_MIN_TOKENS:
+            return None
+
+        try:
+            if self.provider == "vertex":
+                if vertex_caching is None:
+                    return None
+                cached = vertex_caching.CachedContent.create(
+                    model_name=self.model_name,
+                    system_instruction=self.system_instruction,
+                    ttl=PROMPT_CACHE_TTL,
+                )
+            else:
+                cached = genai.caching.CachedContent.create(
+                    model=self.model_name,
+                    system_instruction=self.system_instruction,
+                    ttl=PROMPT_CACHE_TTL,
+                )
+        except Exception as e:
+            self._log_error(f"Prompt cache creation failed: {str(e)}")
+            return None
+        return cached.name
+
+    def _refresh_prompt_cache(self):
+        """Recreate an expired prompt cache and drop the model bound to it"""
+        cache = self._create_prompt_cache()
+        with self._model_lock:
+            self._cache = cache
+            self._cache_pending = False
+            self._model = None
+
+    def _get_model(self):
+        """Return this agent's gemini/vertex model, building it on first use"""
+        model = self._model
+        if model is None:
+            with self._model_lock:
+                if self._cache_pending:
+                    self._cache = self._create_prompt_cache()
+                    self._cache_pending = False
+                if self._model is None:
+                    self._model = self._build_model()
+                model = self._model
+        return model
+
+    def warmup(self):
+        """Build provider objects ahead of the first generate() call"""
+        if self.provider in ("vertex", "gemini"):
+            self._get_model()
+        elif self.provider == "claude":
+            _anthropic_client(self._claude_api_key)
+
+    def _build_model(self):
+        """Construct the gemini/vertex GenerativeModel for this agent"""
+        if self.provider == "vertex":
+            if self._cache:
+                return PreviewGenerativeModel.from_cached_content(
+                    cached_content=self._cache)
+            return GenerativeModel(
+                self.model_name,
+                system_instruction=self.system_instruction
+            )
+
+        if self._cache:
+            return genai.GenerativeModel.from_cached_content(
+                cached_content=self._cache)
+        # Note: genai.GenerativeModel supports safety_settings and
+        # system_instruction
+        return genai.GenerativeModel(
+            self.model_name, system_instruction=self.system_instruction)
 
     def _load_prompt(self) -> str:
         """Load agent prompt from the specified prompt file"""
@@ -157,42 +480,25 @@ class BaseAgent:
                 f"Prompt file not found: {
                     self.prompt_file_path}")
 
-        with open(self.prompt_file_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        return _read_prompt_cached(str(self.prompt_file_path))
+
+    @staticmethod
+    async def _run_blocking(fn):
+        """Run a blocking provider call on the dedicated LLM executor"""
+        async with _llm_semaphore():
+            return await asyncio.get_running_loop().run_in_executor(
+                _LLM_EXECUTOR, fn)
 
     async def generate(self, prompt: str) -> str:
         """Generate response text from the configured backend"""
         if self.provider == "vertex":
-            # Vertex AI doesn't have native async support, so we use
-            # asyncio.to_thread
-            def _generate_sync_vertex():
-                model = GenerativeModel(
-                    self.model_name,
-                    system_instruction=self.system_instruction
-                )
-                try:
-                    response = model.generate_content(
-                        prompt,
-                        generation_config=self.generation_config
-                    )
-                    if hasattr(response, 'text'):
-                        return response.text
-                    elif hasattr(response, 'candidates') and len(response.candidates) > 0:
-                        candidate = response.candidates[0]
-                        if hasattr(candidate, 'content'):
-                            content = candidate.content
-                            if hasattr(
-                                    content, 'parts') and len(
-                                    content.parts) > 0:
-                                return content.parts[0].text
-                    return str(response)
-                except Exception as e:
-                    raise ValueError(
-                        f"Vertex AI generation failed: {
-                            str(e)}\nPrompt length: {
-                            len(prompt)} chars")
-
-            return await asyncio.to_thread(_generate_sync_vertex)
+            try:
+                return await self._generate_content_async(prompt)
+            except Exception as e:
+                raise ValueError(
+                    f"Vertex AI generation failed: {
+                        str(e)}\nPrompt length: {
+                        len(prompt)} chars")
 
         # Claude Code CLI path (uses Claude Code subscription, no API key)
         if self.provider == "claude-code":
@@ -212,7 +518,7 @@ class BaseAgent:
                     if result.returncode != 0:
                         raise ValueError(
                             f"Claude Code CLI error: {result.stderr.strip()}")
-                    data = json.loads(result.stdout)
+                    data = _loads(result.stdout)
                     return data.get("result", data.get("content", result.stdout))
                 except subprocess.TimeoutExpired:
                     raise ValueError(
@@ -225,12 +531,12 @@ class BaseAgent:
                     raise ValueError(
                         f"Claude Code CLI generation failed: {str(e)}\nPrompt length: {len(full_prompt)} chars")
 
-            return await asyncio.to_thread(_generate_sync_claude_code)
+            return await self._run_blocking(_generate_sync_claude_code)
 
         # Claude (Anthropic) API path
         if self.provider == "claude":
             def _generate_sync_claude():
-                client = anthropic_sdk.Anthropic(api_key=self._claude_api_key)
+                client = _anthropic_client(self._claude_api_key)
                 try:
                     response = client.messages.create(
                         model=self.model_name,
@@ -244,39 +550,143 @@ class BaseAgent:
                     raise ValueError(
                         f"Claude API generation failed: {str(e)}\nPrompt length: {len(prompt)} chars")
 
-            return await asyncio.to_thread(_generate_sync_claude)
+            return await self._run_blocking(_generate_sync_claude)
 
         # Gemini API path
-        def _generate_sync_gemini():
-            # Build model with optional system_instruction
-            # Note: genai.GenerativeModel supports safety_settings and
-            # system_instruction
-            model = genai.GenerativeModel(
-                self.model_name, system_instruction=self.system_instruction)
+        try:
+            return await self._generate_content_async(prompt)
+        except Exception as e:
+            raise ValueError(
+                f"Gemini API generation failed: {
+                    str(e)}\nPrompt length: {
+                    len(prompt)} chars")
+
+    async def _generate_content_async(self, prompt: str) -> str:
+        """Native async gemini/vertex call; recreates an expired prompt cache once"""
+        async with _llm_semaphore():
             try:
-                response = model.generate_content(
-                    prompt, generation_config=self.generation_config)
-                # google-generativeai returns response.text for most cases
-                return getattr(response, 'text', str(response))
+                return await self._request_text(prompt)
             except Exception as e:
-                raise ValueError(
-                    f"Gemini API generation failed: {
-                        str(e)}\nPrompt length: {
-                        len(prompt)} chars")
+                if not (self._cache and _is_cache_expired_error(e)):
+                    raise
+
+            # Cache TTL lapsed: recreate (blocking SDK call) and retry once
+            await asyncio.get_running_loop().run_in_executor(
+                _LLM_EXECUTOR, self._refresh_prompt_cache)
+            return await self._request_text(prompt)
+
+    async def _request_text(self, prompt: str) -> str:
+        """Request a gemini/vertex completion, streaming it if STREAM_OUTPUT"""
+        model = self._model
+        if model is None:
+            # Creating the prompt cache and from_cached_content are blocking
+            # network calls
+            model = await asyncio.get_running_loop().run_in_executor(
+                _LLM_EXECUTOR, self._get_model)
+        if not self.STREAM_OUTPUT:
+            response = await model.generate_content_async(
+                prompt, generation_config=self.generation_config)
+            return self._response_text(response)
+
+        response = await model.generate_content_async(
+            prompt, generation_config=self.generation_config, stream=True)
+        parts = []
+        received = 0
+        async for chunk in response:
+            try:
+                text = self._response_text(chunk)
+            except ValueError:  # chunk without text parts (e.g. finish only)
+                continue
+            parts.append(text)
+            received += len(text)
+            if self.on_progress is not None:
+                self.on_progress(received)
+        return "".join(parts)
+
+    def _response_text(self, response) -> str:
+        """Extract text from a gemini/vertex response or stream chunk"""
+        if self.provider == "vertex":
+            return self._vertex_response_text(response)
+        # google-generativeai returns response.text for most cases
+        return getattr(response, 'text', str(response))
 
-        return await asyncio.to_thread(_generate_sync_gemini)
+    @staticmethod
+    def _vertex_response_text(response) -> str:
+        """Extract text from a Vertex AI response"""
+        if hasattr(response, 'text'):
+            return response.text
+        elif hasattr(response, 'candidates') and len(response.candidates) > 0:
+            candidate = response.candidates[0]
+            if hasattr(candidate, 'content'):
+                content = candidate.content
+                if hasattr(
+                        content, 'parts') and len(
+                        content.parts) > 0:
+                    return content.parts[0].text
+        return str(response)
 
     async def generate_json(
             self, prompt: str, retries: int = 1) -> Dict[str, Any]:
+        """Generate and parse JSON, serving repeats from the response cache.
+
+        The cache is only consulted when LABGENIE_RESPONSE_CACHE=1. Callers
+        get a copy, so mutating a result never changes the cached entry.
+        """
+        if not _response_cache_enabled():
+            return await self._generate_json_uncached(prompt, retries)
+
+        key = self._response_cache_key(prompt)
+        cached = self._response_cache_get(key)
+        if cached is not None:
+            return cached
+
+        result = await self._generate_json_uncached(prompt, retries)
+        self._response_cache_put(key, result)
+        return copy.deepcopy(result)
+
+    def _response_cache_key(self, prompt: str) -> str:
+        raw = (f"{self.__class__.__name__}|{self.provider}|"
+               f"{self.model_name}|{prompt}")
+        return hashlib.blake2b(
+            raw.encode("utf-8"), digest_size=16).hexdigest()
+
+    @classmethod
+    def _get_disk_cache(cls):
+        if cls._disk_cache is None and diskcache is not None:
+            BaseAgent._disk_cache = diskcache.Cache(str(RESPONSE_CACHE_DIR))
+        return cls._disk_cache
+
+    def _response_cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        hit = BaseAgent._response_cache.get(key)
+        if hit is None:
+            disk = self._get_disk_cache()
+            if disk is not None:
+                hit = disk.get(key)
+                if hit is not None:
+                    BaseAgent._response_cache[key] = hit
+        return copy.deepcopy(hit) if hit is not None else None
+
+    def _response_cache_put(self, key: str, result: Dict[str, Any]):
+        BaseAgent._response_cache[key] = result
+        disk = self._get_disk_cache()
+        if disk is not None:
+            disk.set(key, result)
+
+    async def _generate_json_uncached(
+            self, prompt: str, retries: int = 1) -> Dict[str, Any]:
         """Generate and parse JSON with retries and repair fallback."""
-        # 0) First attempt: instruct for strict JSON
-        strict_prompt = (
-            f"{prompt}\n\n"
-            "STRICT OUTPUT REQUIREMENTS:\n"
-            "- Return valid JSON only.\n"
-            "- Do not include any markdown code fences.\n"
-            "- No commentary or explanations, JSON only.\n"
-        )
+        # 0) First attempt: instruct for strict JSON unless the backend
+        # already constrains decoding to JSON
+        if self._json_mime_type_enabled():
+            strict_prompt = prompt
+        else:
+            strict_prompt = (
+                f"{prompt}\n\n"
+                "STRICT OUTPUT REQUIREMENTS:\n"
+                "- Return valid JSON only.\n"
+                "- Do not include any markdown code fences.\n"
+                "- No commentary or explanations, JSON only.\n"
+            )
 
         try:
             response_text = await self.generate(strict_prompt)
@@ -326,21 +736,114 @@ class BaseAgent:
             f"See logs for full response."
         )
 
-    def _log_error(self, message: str):
-        """Log error to file for debugging"""
-        log_dir = Path("logs") / "agent_errors"
-        log_dir.mkdir(parents=True, exist_ok=True)
+    def supports_batch(self) -> bool:
+        """True when submit_batch can be used for this agent"""
+        return self.provider == "gemini" and google_genai is not None
+
+    async def submit_batch(self, items: List[str]) -> List[Dict[str, Any]]:
+        """Run prompts through the Gemini Batch API and parse each result.
+
+        The batch API bills at roughly half the interactive rate but may take
+        minutes to hours, so it is meant for non-interactive backlog runs. The
+        job is polled every BATCH_POLL_INTERVAL seconds.
+
+        Args:
+            items: User prompts; each is sent with this agent's system
+                instruction and generation config
+
+        Returns:
+            One parsed JSON dict per item, in input order. Items without a
+            usable response come back as error dicts.
+        """
+        if not self.supports_batch():
+            raise RuntimeError(
+                "Batch mode requires provider 'gemini' and the google-genai "
+                "package. Install it with: pip install google-genai")
+
+        loop = asyncio.get_running_loop()
+        client = google_genai.Client(api_key=self._gemini_api_key)
+
+        def _submit() -> str:
+            with tempfile.NamedTemporaryFile(
+                    "w", suffix=".jsonl", encoding="utf-8",
+                    delete=False) as f:
+                for idx, item in enumerate(items):
+                    f.write(dumps_compact({
+                        "key": str(idx),
+                        "request": {
+                            "contents": [{"parts": [{"text": item}]}],
+                            "system_instruction": {
+                                "parts": [{"text": self.system_instruction}]},
+                            "generation_config": self.generation_config,
+                        },
+                    }) + "\n")
+                input_path = f.name
+            try:
+                uploaded = client.files.upload(
+                    file=input_path,
+                    config={"display_name": f"labgenie-{self.__class__.__name__}",
+                            "mime_type": "jsonl"})
+            finally:
+                os.unlink(input_path)
+            job = client.batches.create(
+                model=self.model_name, src=uploaded.name)
+            return job.name
+
+        job_name = await loop.run_in_executor(_LLM_EXECUTOR, _submit)
+
+        while True:
+            job = await loop.run_in_executor(
+                _LLM_EXECUTOR, lambda: client.batches.get(name=job_name))
+            if job.state.name in _BATCH_DONE_STATES:
+                break
+            await asyncio.sleep(BATCH_POLL_INTERVAL)
+
+        if job.state.name != "JOB_STATE_SUCCEEDED":
+            self._log_error(f"Batch {job_name} ended in state {job.state.name}")
+            raise ValueError(
+                f"Gemini batch {job_name} ended in state {job.state.name}")
+
+        raw = await loop.run_in_executor(
+            _LLM_EXECUTOR,
+            lambda: client.files.download(file=job.dest.file_name))
+
+        texts: Dict[int, str] = {}
+        # Split on \n only: splitlines() also breaks on U+2028 in strings
+        for line in raw.decode("utf-8").split("\n"):
+            if not line.strip():
+                continue
+            entry = _loads(line)
+            try:
+                parts = entry["response"]["candidates"][0]["content"]["parts"]
+                texts[int(entry["key"])] = parts[0]["text"]
+            except (KeyError, IndexError, TypeError, ValueError):
+                self._log_error(
+                    f"Batch {job_name} item {entry.get('key')} has no "
+                    f"response: {str(entry.get('error'))[:500]}")
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_file = log_dir / f"error_{timestamp}.log"
+        results: List[Dict[str, Any]] = []
+        for idx in range(len(items)):
+            try:
+                results.append(self.parse_json_response(texts[idx]))
+            except (KeyError, ValueError) as e:
+                results.append({
+                    "status": "error",
+                    "error": True,
+                    "reason": f"Batch item {idx} failed: {str(e)[:500]}"
+                })
+        return results
+
+    def _json_mime_type_enabled(self) -> bool:
+        """True when generation_config requests application/json output"""
+        config = self.generation_config
+        if not isinstance(config, dict):
+            config = config.to_dict()
+        return config.get("response_mime_type") == "application/json"
 
-        with open(log_file, "a") as f:
-            f.write(f"\n{'=' * 80}\n")
-            f.write(f"Time: {datetime.now().isoformat()}\n")
-            f.write(f"Agent: {self.__class__.__name__}\n")
-            f.write(f"Model: {self.model_name}\n")
-            f.write(f"{message}\n")
-            f.write(f"{'=' * 80}\n")
+    def _log_error(self, message: str):
+        """Log error to logs/agent_errors.log for debugging"""
+        _get_error_logger().error(
+            "%s | %s | %s", self.__class__.__name__, self.model_name, message)
 
     @staticmethod
     def clean_json_response(response_text: str) -> str:
@@ -369,9 +872,9 @@ class BaseAgent:
                 "’",
             "'")
         # Remove trailing commas before object/array closers
-        s = re.sub(r",\s*(?=[}\]])", "", s)
+        s = _TRAILING_COMMA_RE.sub("", s)
         # Ensure keys are quoted (very conservative: only for simple word keys)
-        s = re.sub(r'(?m)^(\s*)([A-Za-z0-9_]+)\s*:', r'\1"\2":', s)
+        s = _KEY_QUOTE_RE.sub(r'\1"\2":', s)
         # Strip stray backticks
         s = s.replace("```", "")
         return s.strip()
@@ -392,6 +895,13 @@ class BaseAgent:
         """
         cleaned_text = BaseAgent.clean_json_response(response_text)
 
+        # 0) Fast path for well-formed output
+        if orjson is not None:
+            try:
+                return orjson.loads(cleaned_text)
+            except orjson.JSONDecodeError:
+                pass
+
         # 1) Try direct parse
         try:
             return json.loads(cleaned_text)
@@ -405,12 +915,24 @@ class BaseAgent:
         except json.JSONDecodeError:
             pass
 
+        # 2b) json_repair for what the regexes miss (missing commas, quotes...)
+        # It also "completes" truncated output, so only use it on text that
+        # is closed: a response cut off at max tokens must fail and retry
+        if json_repair is not None and _json_is_closed(cleaned_text):
+            try:
+                repaired_obj = json_repair.loads(cleaned_text)
+            except Exception:
+                repaired_obj = None
+            # json_repair returns "" / empty containers when it finds nothing
+            if isinstance(repaired_obj, dict) and repaired_obj:
+                return repaired_obj
+
         # 3) Try extracting the largest JSON object substring
-        m = re.search(r"\{[\s\S]*\}", repaired)
+        m = _JSON_OBJ_RE.search(repaired)
         if m:
             candidate = m.group(0)
             # Remove trailing commas again in case extraction changed context
-            candidate2 = re.sub(r",\s*(?=[}\]])", "", candidate)
+            candidate2 = _TRAILING_COMMA_RE.sub("", candidate)
             try:
                 return json.loads(candidate2)
             except json.JSONDecodeError:
@@ -423,10 +945,10 @@ class BaseAgent:
                     error = e
         else:
             # Try array extraction as top-level JSON
-            m_arr = re.search(r"\[[\s\S]*\]", repaired)
+            m_arr = _JSON_ARR_RE.search(repaired)
             if m_arr:
                 candidate = m_arr.group(0)
-                candidate2 = re.sub(r",\s*(?=[}\]])", "", candidate)
+                candidate2 = _TRAILING_COMMA_RE.sub("", candidate)
                 try:
                     return json.loads(candidate2)
                 except json.JSONDecodeError:
@@ -0,0 +1,84 @@
+"""
+Batch pipeline runner
+Runs convert → parse → plan → build for many write-up URLs, stage by stage
+"""
+
+import asyncio
+import os
+from typing import Any, Dict, List, Optional
+
+from .WriteUpToMarkdown.agent import WriteUpToMarkdownAgent
+from .WriteupParser.agent import WriteupParserAgent
+from .LabCorePlanner.agent import LabCorePlannerAgent
+from .LabBuilder.agent import LabBuilderAgent
+
+
+def stage_failed(result: Any) -> bool:
+    """True for stage outputs that should not be passed to the next stage"""
+    if isinstance(result, BaseException) or not isinstance(result, dict):
+        return True
+    # "partial" results are usable; "error" may be left null on failure
+    return bool(result.get("error")) or result.get("status") == "error"
+
+
+async def run_pipeline_batch(
+        urls: List[str],
+        api_key: Optional[str] = None,
+        provider: Optional[str] = None,
+        models: Optional[Dict[str, str]] = None) -> List[Any]:
+    """Run the four-agent pipeline over many URLs concurrently.
+
+    Each stage runs for every still-healthy URL with asyncio.gather before
+    the next stage starts. One semaphore (LABGENIE_MAX_CONCURRENCY, default
+    16) is shared by all stages to stay under provider rate limits.
+
+    Args:
+        urls: Write-up URLs to process
+        api_key: API key passed to every agent
+        provider: Provider passed to every agent
+        models: Optional {agent_name: model} map (config.json format)
+
+    Returns:
+        One entry per URL, in input order: the LabBuilder result dict, or the
+        exception / error dict from the stage where that URL failed.
+    """
+    models = models or {}
+    semaphore = asyncio.Semaphore(
+        int(os.getenv("LABGENIE_MAX_CONCURRENCY", "16")))
+
+    converter = WriteUpToMarkdownAgent(
+        api_key=api_key, provider=provider,
+        model=models.get("WriteUpToMarkdown"))
+    parser = WriteupParserAgent(
+        api_key=api_key, provider=provider,
+        model=models.get("WriteupParser"))
+    planner = LabCorePlannerAgent(
+        api_key=api_key, provider=provider,
+        model=models.get("LabCorePlanner"))
+    builder = LabBuilderAgent(
+        api_key=api_key, provider=provider,
+        model=models.get("LabBuilder"))
+
+    async def bounded(coro):
+        async with semaphore:
+            return await coro
+
+    async def run_stage(stage, inputs: List[Any]) -> List[Any]:
+        pending = [i for i, item in enumerate(inputs) if not stage_failed(item)]
+        outputs = await asyncio.gather(
+            *(bounded(stage(inputs[i])) for i in pending),
+            return_exceptions=True)
+        results = list(inputs)
+        for i, output in zip(pending, outputs):
+            results[i] = output
+        return results
+
+    try:
+        results = await asyncio.gather(
+            *(bounded(converter.convert(url)) for url in urls),
+            return_exceptions=True)
+        results = await run_stage(parser.parse, list(results))
+        results = await run_stage(planner.plan, results)
+        return await run_stage(builder.build, results)
+    finally:
+        await WriteUpToMarkdownAgent.aclose_client()
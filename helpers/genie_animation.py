@@ -2,40 +2,87 @@
 🧞 ULTRA ENHANCED GENIE ANIMATION 🧞
 Maximum Visual Impact - Production Ready Awesomeness
 """
+from __future__ import annotations
+
 import asyncio
+import contextlib
+import functools
+import itertools
+import os
 import time
 import random
-from typing import Any, Optional
-from rich.console import Console
-from rich.panel import Panel
-from rich.text import Text
-from rich.table import Table
-from rich import box
-from rich.live import Live
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Optional
+
+# Rich submodules are imported inside the functions that use them, so
+# importing this module stays cheap; sys.modules makes repeats a lookup.
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.live import Live
+    from rich.panel import Panel
+    from rich.text import Text
+
+try:
+    import uvloop  # type: ignore
+except Exception:  # optional; the default asyncio loop is used
+    uvloop = None  # type: ignore
+
+
+_PARTICLES = ("✨", "⭐", "💫", "🌟", "✦", "★", "◆", "◇", " ", " ", " ")
+_RAIN_PARTICLES = ("✨", "⭐", "💫", "🌟", "✦", "★")
+# Progress bars for every fill level of a 20-cell bar
+_BARS_20 = tuple("▰" * i + "▱" * (20 - i) for i in range(21))
+_BARS_POWER_20 = tuple("█" * i + "░" * (20 - i) for i in range(21))
+_SPINNERS = ("🔮", "✨", "💫", "⚡", "🌟", "⭐")
+_SUCCESS_ART = r"""
+    ⭐ ✨ 💫 🌟 ⚡ 💫 ✨ ⭐
+
+       🎉 SUCCESS! 🎉
+
+      🧞 Lab Created! 🧞
+
+    ⭐ ✨ 💫 🌟 ⚡ 💫 ✨ ⭐
+    """
+_PROVIDER_LABELS = {
+    "claude-code": "Claude Code (subscription)",
+    "claude":      "Claude API",
+    "gemini":      "Gemini API",
+    "vertex":      "Vertex AI",
+}
+
+
+def _animations_enabled(console: Console) -> bool:
+    """Animations only run on a real terminal and can be disabled by env"""
+    return console.is_terminal and not os.getenv("LABGENIE_NO_ANIM")
 
 
 def create_particle_field(width: int = 60, height: int = 5) -> str:
     """Create a random particle field effect"""
-    particles = ["✨", "⭐", "💫", "🌟", "✦", "★", "◆", "◇", " ", " ", " "]
-    field = []
-    for _ in range(height):
-        row = "".join(random.choice(particles) for _ in range(width))
-        field.append(row)
-    return "\n".join(field)
+    picks = random.choices(_PARTICLES, k=width * height)
+    return "\n".join(
+        "".join(picks[row * width:(row + 1) * width])
+        for row in range(height))
 
 
 def get_gradient_text(text: str, colors: list) -> Text:
     """Create gradient text effect"""
-    result = Text()
-    for i, char in enumerate(text):
-        color = colors[i % len(colors)] if colors else "white"
-        result.append(char, style=color)
-    return result
+    from rich.text import Text
+    return Text.from_markup(_gradient_markup(text, colors or ["white"]))
+
 
+def _gradient_markup(text: str, colors) -> str:
+    """Markup string colouring each character of text in turn"""
+    from rich.markup import escape
+    return "".join(
+        f"[{color}]{escape(char)}[/]"
+        for char, color in zip(text, itertools.cycle(colors)))
 
+
+@functools.lru_cache(maxsize=1)
 def create_epic_startup_banner() -> Panel:
-    """Create startup banner"""
-    banner = Text()
+    """Create startup banner (constant, so built once and reused)"""
+    from rich import box
+    from rich.panel import Panel
+    from rich.text import Text
 
     # Title with gradient
     title_colors = [
@@ -45,17 +92,13 @@ def create_epic_startup_banner() -> Panel:
         "bold yellow",
         "bold green"]
 
-    banner.append("     ", style="bold")  # Center alignment
-    for i, char in enumerate("⚡ LAB GENIE ⚡"):
-        banner.append(char, style=title_colors[i % len(title_colors)])
-    banner.append("\n", style="bold")
-
-    # Subtitle
-    banner.append("     ━━━━━━━━━━━━━━━\n", style="cyan")
-    banner.append("     Vulnerabilities → Labs\n", style="bold white")
-    banner.append("     ━━━━━━━━━━━━━━━\n", style="cyan")
-
-    banner.append("     🧞 ✨ 🔮 ⚡ 💫 🌟\n", style="")
+    banner = Text.from_markup(
+        "     " + _gradient_markup("⚡ LAB GENIE ⚡", title_colors) + "\n"
+        # Subtitle
+        "[cyan]     ━━━━━━━━━━━━━━━[/]\n"
+        "[bold white]     Vulnerabilities → Labs[/]\n"
+        "[cyan]     ━━━━━━━━━━━━━━━[/]\n"
+        "     🧞 ✨ 🔮 ⚡ 💫 🌟\n")
 
     return Panel(
         banner,
@@ -66,15 +109,9 @@ def create_epic_startup_banner() -> Panel:
     )
 
 
-def create_loading_frame(
-        step: int,
-        total: int = 4,
-        message: str = "Processing") -> Panel:
-    """Create a fancy loading frame with progress"""
-
-    # Genie states based on progress
-    genie_states = [
-        r"""
+# Loading-frame palettes, indexed by step
+_GENIE_STATES = (
+    r"""
     ___
    /   \
   | 🧞  |
@@ -82,7 +119,7 @@ def create_loading_frame(
     | |
   ∼∼∼∼∼
 """,
-        r"""
+    r"""
     ___
    / ✨ \
   | 🧞  |
@@ -90,7 +127,7 @@ def create_loading_frame(
     | |
   ∼∼∼∼∼
 """,
-        r"""
+    r"""
     ___
    /⚡ ⚡\
   |✨🧞✨|
@@ -98,7 +135,7 @@ def create_loading_frame(
   💫| |💫
   ∼∼∼∼∼
 """,
-        r"""
+    r"""
   ⭐ ___  ⭐
    /💫💫\
   |⚡🧞⚡|
@@ -106,7 +143,7 @@ def create_loading_frame(
   ✨ | | ✨
   ∼∼∼∼∼∼
 """,
-        r"""
+    r"""
  💫⭐___⭐💫
   /✨✨✨\
  ⚡|🧞💫|⚡
@@ -114,30 +151,40 @@ def create_loading_frame(
  🌟 | | 🌟
   ∼∼∼∼∼∼
 """,
-    ]
+)
+_PROGRESS_COLORS = ("cyan", "magenta", "yellow", "green", "bold green")
+_BORDER_COLORS = ("blue", "magenta", "cyan", "yellow", "green")
+_LOADING_PARTICLES = ("✨ 💫 ⭐", "⚡ 🌟 ✨", "💫 ⭐ 🔮", "✨ ⚡ 💫")
+
+
+@functools.lru_cache(maxsize=64)
+def _loading_frame_static(
+        step: int,
+        total: int,
+        message: str,
+        particles: str) -> Panel:
+    """Build a loading frame; cached since the input set is tiny"""
+    from rich import box
+    from rich.panel import Panel
+    from rich.markup import escape
+    from rich.text import Text
 
-    genie = genie_states[min(step, len(genie_states) - 1)]
+    genie = _GENIE_STATES[min(step, len(_GENIE_STATES) - 1)]
 
     # Progress bar
     filled = "▰" * step
     empty = "▱" * (total - step)
-    progress_colors = ["cyan", "magenta", "yellow", "green", "bold green"]
-    progress_color = progress_colors[min(step, len(progress_colors) - 1)]
+    progress_color = _PROGRESS_COLORS[min(step, len(_PROGRESS_COLORS) - 1)]
 
     progress_bar = f"[{progress_color}]{filled}[/][dim]{empty}[/dim] {step * 20}%"
 
-    # Particle effect
-    particles = random.choice(["✨ 💫 ⭐", "⚡ 🌟 ✨", "💫 ⭐ 🔮", "✨ ⚡ 💫"])
-
-    content = Text()
-    content.append(genie, style="bold magenta")
-    content.append("\n")
-    content.append(f"     {message}\n", style="bold cyan")
-    content.append(f"     {particles}\n\n", style="")
-    content.append(f"     {progress_bar}\n", style="")
+    content = Text.from_markup(
+        f"[bold magenta]{escape(genie)}[/]\n"
+        f"[bold cyan]     {escape(message)}[/]\n"
+        f"     {particles}\n\n"
+        f"     {progress_bar}\n")
 
-    border_colors = ["blue", "magenta", "cyan", "yellow", "green"]
-    border_color = border_colors[min(step, len(border_colors) - 1)]
+    border_color = _BORDER_COLORS[min(step, len(_BORDER_COLORS) - 1)]
 
     return Panel(
         content,
@@ -148,37 +195,69 @@ def create_loading_frame(
     )
 
 
+def create_loading_frame(
+        step: int,
+        total: int = 4,
+        message: str = "Processing") -> Panel:
+    """Create a fancy loading frame with progress"""
+    particles = random.choice(_LOADING_PARTICLES)
+    return _loading_frame_static(step, total, message, particles)
+
+
+_STARTUP_STEPS = (
+    "Initializing Magic",
+    "Loading Spells",
+    "Charging Energy",
+    "Ready to Create",
+)
+
+
 def animate_startup(console: Console, duration: float = 1.5):
     """Animate an epic startup sequence"""
-    steps = [
-        "Initializing Magic",
-        "Loading Spells",
-        "Charging Energy",
-        "Ready to Create"
-    ]
+    from rich.live import Live
 
+    if not _animations_enabled(console):
+        return
+
+    steps = _STARTUP_STEPS
     with Live(console=console, refresh_per_second=10, transient=True) as live:
         for i, step in enumerate(steps):
-            frame = create_loading_frame(i, len(steps), step)
-            live.update(frame)
+            live.update(create_loading_frame(i, len(steps), step))
             time.sleep(duration / len(steps))
 
 
+async def animate_startup_async(console: Console, duration: float = 1.5):
+    """animate_startup for async callers; yields to the event loop"""
+    from rich.live import Live
+
+    if not _animations_enabled(console):
+        return
+
+    steps = _STARTUP_STEPS
+    with Live(console=console, refresh_per_second=10, transient=True) as live:
+        for i, step in enumerate(steps):
+            live.update(create_loading_frame(i, len(steps), step))
+            await asyncio.sleep(duration / len(steps))
+
+
 def create_step_animation(
         step_name: str,
         description: str,
         progress: float = 0.0,
-        elapsed_time: str = "00:00") -> Panel:
+        elapsed_time: str = "00:00",
+        frame: int = 0) -> Panel:
     """Create animated panel for workflow step with timer"""
+    from rich import box
+    from rich.panel import Panel
+    from rich.markup import escape
+    from rich.text import Text
 
-    # Rotating spinner symbols
-    spinners = ["🔮", "✨", "💫", "⚡", "🌟", "⭐"]
-    spinner = spinners[int(time.time() * 3) % len(spinners)]
+    # Rotating spinner symbols, advanced by the caller's frame counter
+    spinner = _SPINNERS[frame % len(_SPINNERS)]
 
     # Progress visualization (compact for half-screen)
-    bar_width = 20
-    filled_width = int(bar_width * (progress / 100))
-    bar = "▰" * filled_width + "▱" * (bar_width - filled_width)
+    filled_width = max(0, min(20, int(progress) // 5))
+    bar = _BARS_20[filled_width]
 
     # Color based on progress
     if progress < 30:
@@ -188,13 +267,10 @@ def create_step_animation(
     else:
         color = "green"
 
-    content = Text()
-    content.append(f"{spinner} ", style="bold magenta")
-    content.append(step_name, style="bold white")
-    content.append("\n")
-    content.append(f"{description}\n", style="dim")
-    content.append(f"\n{bar} {progress:.0f}%", style=color)
-    content.append(f"  ⏱ {elapsed_time}", style=color)
+    content = Text.from_markup(
+        f"[bold magenta]{spinner}[/] [bold white]{escape(step_name)}[/]\n"
+        f"[dim]{escape(description)}[/]\n"
+        f"[{color}]\n{bar} {progress:.0f}%  ⏱ {escape(elapsed_time)}[/]")
 
     return Panel(
         content,
@@ -205,29 +281,23 @@ def create_step_animation(
     )
 
 
+@functools.lru_cache(maxsize=32)
 def create_success_banner(
         lab_name: str,
         file_count: int,
         total_time: str = "00:00") -> Panel:
     """Create epic success banner with total time"""
-
-    success_art = r"""
-    ⭐ ✨ 💫 🌟 ⚡ 💫 ✨ ⭐
-
-       🎉 SUCCESS! 🎉
-
-      🧞 Lab Created! 🧞
-
-    ⭐ ✨ 💫 🌟 ⚡ 💫 ✨ ⭐
-    """
-
-    content = Text()
-    content.append(success_art, style="bold green")
-    content.append("\n")
-    content.append(f"  Lab: {lab_name}\n", style="bold cyan")
-    content.append(f"  Files: {file_count}\n", style="bold yellow")
-    content.append(f"  Time: {total_time}\n", style="bold magenta")
-    content.append("\n  ✨ Ready to Deploy! ✨\n", style="bold white")
+    from rich import box
+    from rich.panel import Panel
+    from rich.markup import escape
+    from rich.text import Text
+
+    content = Text.from_markup(
+        f"[bold green]{_SUCCESS_ART}[/]\n"
+        f"[bold cyan]  Lab: {escape(lab_name)}[/]\n"
+        f"[bold yellow]  Files: {file_count}[/]\n"
+        f"[bold magenta]  Time: {escape(total_time)}[/]\n"
+        "[bold white]\n  ✨ Ready to Deploy! ✨[/]\n")
 
     return Panel(
         content,
@@ -239,29 +309,55 @@ def create_success_banner(
     )
 
 
+def _matrix_rain_frame() -> Panel:
+    """One random frame of the particle rain"""
+    from rich import box
+    from rich.panel import Panel
+
+    picks = random.choices(_RAIN_PARTICLES, k=60)
+    lines = (" ".join(picks[row * 20:(row + 1) * 20]) for row in range(3))
+
+    return Panel(
+        "\n".join(lines),
+        border_style="bold cyan",
+        box=box.MINIMAL
+    )
+
+
 def create_matrix_rain(console: Console, duration: float = 1.5):
     """Create Matrix-style particle rain effect"""
-    particles = ["✨", "⭐", "💫", "🌟", "✦", "★"]
+    from rich.live import Live
+
+    if not _animations_enabled(console):
+        return
 
     with Live(console=console, refresh_per_second=20, transient=True) as live:
-        start_time = time.time()
-        while time.time() - start_time < duration:
-            lines = []
-            for _ in range(3):
-                line = " ".join(random.choice(particles) for _ in range(20))
-                lines.append(line)
-
-            panel = Panel(
-                "\n".join(lines),
-                border_style="bold cyan",
-                box=box.MINIMAL
-            )
-            live.update(panel)
+        start_time = time.monotonic()
+        while time.monotonic() - start_time < duration:
+            live.update(_matrix_rain_frame())
             time.sleep(0.05)
 
 
-def create_power_meter(power_level: int = 100) -> Table:
-    """Create a power meter display"""
+async def create_matrix_rain_async(console: Console, duration: float = 1.5):
+    """create_matrix_rain for async callers; yields to the event loop"""
+    from rich.live import Live
+
+    if not _animations_enabled(console):
+        return
+
+    with Live(console=console, refresh_per_second=20, transient=True) as live:
+        start_time = time.monotonic()
+        while time.monotonic() - start_time < duration:
+            live.update(_matrix_rain_frame())
+            await asyncio.sleep(0.05)
+
+
+@functools.lru_cache(maxsize=101)
+def create_power_meter(power_level: int = 100) -> Panel:
+    """Create a power meter display (cached per power level)"""
+    from rich import box
+    from rich.panel import Panel
+    from rich.table import Table
     table = Table(show_header=False, box=box.SIMPLE, padding=(0, 1))
 
     table.add_column(justify="right")
@@ -276,9 +372,8 @@ def create_power_meter(power_level: int = 100) -> Table:
     ]
 
     for label, level in meters:
-        bar_width = 20
-        filled = int(bar_width * (level / 100))
-        bar = "█" * filled + "░" * (bar_width - filled)
+        filled = max(0, min(20, int(20 * (level / 100))))
+        bar = _BARS_POWER_20[filled]
 
         if level >= 80:
             color = "bold green"
@@ -297,6 +392,29 @@ def create_power_meter(power_level: int = 100) -> Table:
     )
 
 
+def run_with_fast_loop(main: Any, use_uvloop: bool = True) -> Any:
+    """Run a coroutine to completion, on uvloop when it is installed.
+
+    uvloop.run avoids the event loop policy API deprecated in Python 3.14;
+    without uvloop (or with use_uvloop=False) this is plain asyncio.run.
+    """
+    if use_uvloop and uvloop is not None:
+        return uvloop.run(main)
+    return asyncio.run(main)
+
+
+@contextlib.contextmanager
+def step_display(console: Console) -> Iterator[Optional[Live]]:
+    """One Live shared by consecutive steps (None when animations are off)"""
+    from rich.live import Live
+    if not _animations_enabled(console):
+        yield None
+        return
+    # No auto-refresh thread: steps redraw explicitly when a frame changes
+    with Live(console=console, auto_refresh=False, transient=True) as live:
+        yield live
+
+
 def display_workflow_banner(
         console: Console,
         provider: Optional[str],
@@ -309,13 +427,7 @@ def display_workflow_banner(
     console.print(create_epic_startup_banner())
 
     if verbose:
-        provider_labels = {
-            "claude-code": "Claude Code (subscription)",
-            "claude":      "Claude API",
-            "gemini":      "Gemini API",
-            "vertex":      "Vertex AI",
-        }
-        provider_name = provider_labels.get(
+        provider_name = _PROVIDER_LABELS.get(
             (provider or "").lower(), (provider or "Unknown").title())
         info_text = (
             f"[dim]Provider: {provider_name} | "
@@ -336,15 +448,28 @@ async def execute_step_with_animation(
         file_logger: Optional[Any] = None,
         debug_mode: bool = False,
         verbose: bool = False,
-        agent_input: Any = None) -> Any:
-    """Run a workflow coroutine while rendering live step animations."""
+        agent_input: Any = None,
+        live: Optional[Live] = None,
+        animate: bool = True,
+        received: Optional[Callable[[], int]] = None) -> Any:
+    """Run a workflow coroutine while rendering live step animations.
+
+    Pass a Live from step_display() to reuse it across steps instead of
+    opening a new one per step. animate=False skips the live display, e.g.
+    when several workflows share the console. received, if given, returns
+    the characters streamed so far and is shown under the description.
+    """
+    from rich import box
+    from rich.live import Live
+    from rich.panel import Panel
+    from rich.text import Text
 
     if logger:
         logger.start_step(step_name, description)
 
     result: Any = None
     error: Optional[Exception] = None
-    step_start = time.time()
+    step_start = time.monotonic()
 
     async def run_task():
         nonlocal result, error
@@ -367,7 +492,7 @@ async def execute_step_with_animation(
                             "error"
                         )
                     else:
-                        result_keys = list(result.keys())[:5]
+                        result_keys = list(itertools.islice(result, 5))
                         logger.log_action(
                             "Agent response received",
                             f"Keys: {result_keys}",
@@ -384,38 +509,68 @@ async def execute_step_with_animation(
             if debug_mode and logger:
                 logger.log_action("Exception occurred", str(exc), "error")
 
-    async def make_display_panel() -> Panel:
-        elapsed = time.time() - step_start
+    last_state = None
+    frame = 0
+
+    def make_display_panel() -> Optional[Panel]:
+        """Build the step panel, or None if nothing visible changed"""
+        nonlocal last_state, frame
+        elapsed = time.monotonic() - step_start
         total_elapsed = logger.get_total_elapsed() if logger else "00:00:00"
 
-        hours = int(elapsed // 3600)
-        minutes = int((elapsed % 3600) // 60)
-        seconds = int(elapsed % 60)
+        minutes, seconds = divmod(int(elapsed), 60)
+        hours, minutes = divmod(minutes, 60)
         elapsed_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
 
         progress = min(90, (elapsed / 30) * 100)
 
+        chars = received() if received is not None else 0
+
+        state = (elapsed_str, total_elapsed, int(progress), chars)
+        if state == last_state:
+            return None
+        last_state = state
+        frame += 1
+
         return create_step_animation(
             step_name=step_name,
-            description=description,
+            description=(
+                f"{description}\n📥 {chars:,} characters received"
+                if chars else description),
             progress=progress,
-            elapsed_time=f"Step: {elapsed_str} | Workflow: {total_elapsed}"
+            elapsed_time=f"Step: {elapsed_str} | Workflow: {total_elapsed}",
+            frame=frame
         )
 
     task = asyncio.create_task(run_task())
 
-    with Live(
-            await make_display_panel(),
-            refresh_per_second=4,
-            console=console,
-            transient=True) as live:
-        while not task.done():
-            await asyncio.sleep(0.33)
-            live.update(await make_display_panel())
-
-    await task
+    async def _tick(display: Live):
+        # Wake on completion right away; otherwise tick once a second
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=1.0)
+            if done:
+                break
+            panel = make_display_panel()
+            if panel is not None:
+                display.update(panel, refresh=True)
+
+    if not animate:
+        await task
+    elif live is not None:
+        live.update(make_display_panel(), refresh=True)
+        await _tick(live)
+        live.update(Text(""), refresh=True)
+    elif not _animations_enabled(console):
+        await task
+    else:
+        with Live(
+                make_display_panel(),
+                auto_refresh=False,
+                console=console,
+                transient=True) as step_live:
+            await _tick(step_live)
 
-    step_duration = time.time() - step_start
+    step_duration = time.monotonic() - step_start
 
     if error:
         if logger:
@@ -427,11 +582,10 @@ async def execute_step_with_animation(
 
     result_summary = "Success"
     if isinstance(result, dict):
-        if "files" in result:
-            result_summary = f"Generated {len(result['files'])} files"
-        elif "markdown" in result:
-            markdown_len = len(result['markdown'])
-            result_summary = f"Markdown length: {markdown_len} chars"
+        if (files := result.get("files")) is not None:
+            result_summary = f"Generated {len(files)} files"
+        elif (markdown := result.get("markdown")) is not None:
+            result_summary = f"Markdown length: {len(markdown)} chars"
 
     if logger:
         logger.end_step(True, result_summary)
@@ -471,12 +625,16 @@ def display_success_banner(
 __all__ = [
     'create_epic_startup_banner',
     'animate_startup',
+    'animate_startup_async',
     'create_step_animation',
     'create_success_banner',
     'create_matrix_rain',
+    'create_matrix_rain_async',
     'create_power_meter',
     'create_loading_frame',
     'display_workflow_banner',
+    'step_display',
+    'run_with_fast_loop',
     'execute_step_with_animation',
     'display_success_banner',
 ]
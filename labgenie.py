@@ -6,58 +6,277 @@ Transforms security write-ups into production-ready vulnerable labs
 
 import argparse
 import asyncio
+import atexit
+import contextlib
+import functools
+import hashlib
+import io
+import itertools
 import json
 import os
+import queue
 import re
 import subprocess
 import sys
+import tarfile
+import threading
 import time
 import traceback
 import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import TYPE_CHECKING, Callable, Dict, Any, Optional, List
 
-from rich.console import Console
+from rich.console import Console, Group
+from rich.markup import escape
 from rich.panel import Panel
 from rich.table import Table
-from rich.prompt import Prompt, Confirm
+from rich.text import Text
 from rich import box
-from rich.progress import (
-    Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
-)
 
-from agents.WriteUpToMarkdown.agent import WriteUpToMarkdownAgent
-from agents.WriteupParser.agent import WriteupParserAgent
-from agents.LabCorePlanner.agent import LabCorePlannerAgent
-from agents.LabBuilder.agent import LabBuilderAgent
+# Agent modules (and the provider SDKs they load), rich.progress and
+# rich.prompt are imported where they are first needed, so --help and
+# config errors exit without paying for them.
+if TYPE_CHECKING:
+    from rich.progress import Progress
 
 # Animation helpers
 from helpers.genie_animation import (
+    create_epic_startup_banner,
     display_workflow_banner,
     execute_step_with_animation,
-    display_success_banner
+    display_success_banner,
+    run_with_fast_loop,
+    step_display
 )
 
+try:
+    import orjson  # type: ignore
+except Exception:  # optional speedup; stdlib json is the fallback
+    orjson = None  # type: ignore
+
+try:
+    import zstandard  # type: ignore
+except Exception:  # optional; --archive falls back to tar.gz
+    zstandard = None  # type: ignore
+
 console = Console()
 
+# Characters not allowed in lab directory names (\w already covers "_")
+_LAB_NAME_SANITIZE = re.compile(r'[^\w\-]')
+
+# Static panels, built once at import and reused on every run
+_SAVE_HEADER = Panel(
+    "[bold white]💾 Saving Lab Artifacts[/bold white]",
+    border_style="cyan",
+    box=box.ROUNDED,
+    padding=(0, 1),
+    width=60
+)
+_WRITING_PANEL = Panel(
+    "[bold cyan]⏳ Writing files to disk...[/bold cyan]",
+    border_style="cyan",
+    box=box.ROUNDED,
+    width=60
+)
+_NOTHING_TO_RESUME_PANEL = Panel(
+    "[bold green]✅ All steps already completed in that run![/bold green]\n"
+    "[dim]Nothing to resume — use --file or --url for a fresh run.[/dim]",
+    border_style="green", box=box.ROUNDED, padding=(0, 1), width=60
+)
+_DEBUG_ENABLED_PANEL = Panel(
+    Text("🔍 Debug Mode: ENABLED", style="bold green"),
+    border_style="green",
+    box=box.ROUNDED,
+    padding=(0, 1),
+    width=60
+)
+_INPUT_PROMPT_PANEL = Panel(
+    "[bold white]Vulnerability Write-up Source[/bold white]\n"
+    "[dim]Enter a URL  [bold]or[/bold]  one/more local markdown file paths (space-separated)[/dim]",
+    border_style="cyan",
+    box=box.ROUNDED,
+    padding=(0, 1),
+    width=60
+)
+_INPUT_REQUIRED_PANEL = Panel(
+    "[red]❌ Input is required[/red]",
+    border_style="red", box=box.ROUNDED, padding=(0, 1), width=60
+)
+_WIZARD_HEADER = Panel(
+    "[bold cyan]🧙 LabGenie Configuration Wizard[/bold cyan]",
+    border_style="cyan",
+    box=box.DOUBLE_EDGE,
+    padding=(0, 1),
+    width=60
+)
+_WIZARD_STEP1_PANEL = Panel(
+    "[bold white]Step 1: Vulnerability Write-up[/bold white]",
+    border_style="cyan",
+    box=box.ROUNDED,
+    width=60
+)
+_WIZARD_STEP2_PANEL = Panel(
+    "[bold white]Step 2: Output Configuration[/bold white]",
+    border_style="cyan",
+    box=box.ROUNDED,
+    width=60
+)
+_WIZARD_STEP3_PANEL = Panel(
+    "[bold white]Step 3: Runtime Options[/bold white]",
+    border_style="cyan",
+    box=box.ROUNDED,
+    width=60
+)
+_WIZARD_COMPLETE_PANEL = Panel(
+    Text("✓ Configuration complete!", style="bold green"),
+    border_style="green",
+    box=box.ROUNDED,
+    padding=(0, 1),
+    width=60
+)
+_CLI_DEBUG_PANEL = Panel(
+    Text("🐞 Debug Mode Enabled", style="bold yellow"),
+    border_style="yellow", box=box.ROUNDED, padding=(0, 1), width=60
+)
+_CLI_PROCESSING_PANEL = Panel(
+    Text("🤖 Processing input...", style="bold cyan"),
+    border_style="cyan", box=box.ROUNDED, padding=(0, 1), width=60
+)
+
+
+def _dumps(data: Any, indent: bool = True) -> bytes:
+    """Serialize to UTF-8 JSON bytes (orjson when installed)"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option, default=str)
+    return json.dumps(
+        data, indent=2 if indent else None, default=str,
+        ensure_ascii=False).encode("utf-8")
+
+
+def _loads(raw: Any) -> Any:
+    """Parse JSON from bytes or str (orjson when installed)"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _write_bytes(path: Path, data: bytes):
+    """Write data, creating the parent directory"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+_LOG_BUFFER_SIZE = 1024 * 1024
+
+
+class MarkdownCache:
+    """On-disk LRU cache of successful step 1 results, keyed by URL"""
+
+    def __init__(
+            self,
+            cache_dir: Optional[Path] = None,
+            max_entries: int = 128,
+            max_age: float = 7 * 24 * 3600):
+        base = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+        self.cache_dir = cache_dir or base / "labgenie" / "md"
+        self.max_entries = max_entries
+        self.max_age = max_age
+
+    def _path(self, url: str) -> Path:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for url, or None if missing or stale"""
+        path = self._path(url)
+        try:
+            entry = _loads(path.read_bytes())
+            # Age comes from the fetch time; mtime only orders eviction
+            if time.time() - entry["fetched_at"] > self.max_age:
+                return None
+            result = entry["result"]
+            if not isinstance(result, dict):
+                return None
+            # Touch the entry so eviction drops the least recently used
+            os.utime(path)
+        except Exception:
+            return None
+        return result
+
+    def put(self, url: str, result: Dict[str, Any]):
+        """Store result atomically, then evict the oldest entries"""
+        path = self._path(url)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            entry = {"fetched_at": time.time(), "result": result}
+            _write_bytes(tmp, _dumps(entry, indent=False))
+            os.replace(tmp, path)
+            entries = sorted(
+                self.cache_dir.glob("*.json"),
+                key=lambda p: p.stat().st_mtime)
+            for stale in entries[:-self.max_entries]:
+                stale.unlink(missing_ok=True)
+        except OSError:
+            # The cache is an optimization; never fail the run over it
+            tmp.unlink(missing_ok=True)
+
 
 class FileLogger:
     """Logs agent responses to files for debugging"""
 
-    def __init__(self, run_id: str, log_dir: Path = None):
+    def __init__(self, run_id: str, log_dir: Path = None, pretty: bool = False):
         self.run_id = run_id
+        self.pretty = pretty
         self.log_dir = (log_dir or Path("logs")) / run_id
         self.log_dir.mkdir(parents=True, exist_ok=True)
 
-        # Create run info file
-        info_file = self.log_dir / "run_info.json"
-        with open(info_file, "w") as f:
-            json.dump({
-                "run_id": run_id,
-                "start_time": datetime.now().isoformat(),
-                "status": "running"
-            }, f, indent=2)
+        # Run info stays in memory; finalize() writes run_info.json once
+        self._run_info = {
+            "run_id": run_id,
+            "start_time": datetime.now().isoformat(),
+            "status": "running"
+        }
+
+        # Log writes happen on a background thread; callers only enqueue
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._writer = threading.Thread(
+            target=self._write_loop, name="labgenie-file-logger", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _write_loop(self):
+        """Append queued (log_file, payload) entries, keeping files open"""
+        handles = {}
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                log_file, payload = item
+                handle = handles.get(log_file)
+                if handle is None:
+                    # Large buffer: entries are batched until the queue drains
+                    handle = handles[log_file] = open(
+                        log_file, "ab", buffering=_LOG_BUFFER_SIZE)
+                handle.write(payload)
+                if self._queue.empty():
+                    for h in handles.values():
+                        h.flush()
+        finally:
+            for h in handles.values():
+                h.close()
+
+    def close(self):
+        """Flush pending log entries and stop the writer thread"""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
 
     def log_agent_response(
             self,
@@ -85,105 +304,157 @@ class FileLogger:
                 log_entry["files_list"] = [
                     f.get("path", "no-path") for f in response.get("files", [])[:10]]
 
-        with open(log_file, "a") as f:
-            f.write("\n" + "=" * 80 + "\n")
-            f.write(json.dumps(log_entry, indent=2, default=str))
-            f.write("\n")
+        if self.pretty:
+            payload = b"\n" + b"=" * 80 + b"\n" + _dumps(log_entry) + b"\n"
+        else:
+            # One compact JSON object per line (JSONL)
+            payload = _dumps(log_entry, indent=False) + b"\n"
+        self._queue.put_nowait((log_file, payload))
 
     def _summarize(self, data: Any) -> str:
         """Create a brief summary of input data"""
-        if data is None:
-            return "None"
+        # Agent inputs are mostly dicts, so check those first
+        if isinstance(data, dict):
+            return f"Dict(keys={list(itertools.islice(data, 5))})"
         if isinstance(data, str):
             return f"String({len(data)} chars)"
-        if isinstance(data, dict):
-            return f"Dict(keys={list(data.keys())[:5]})"
+        if data is None:
+            return "None"
         if isinstance(data, list):
             return f"List({len(data)} items)"
         return str(type(data))
 
     def finalize(self, status: str):
         """Mark run as complete"""
+        self.close()
+        self._run_info["status"] = status
+        self._run_info["end_time"] = datetime.now().isoformat()
+
+        # Write to a temp file and swap it in so the file is never partial
         info_file = self.log_dir / "run_info.json"
-        with open(info_file, "r") as f:
-            info = json.load(f)
+        tmp_file = info_file.with_suffix(".json.tmp")
+        tmp_file.write_bytes(_dumps(self._run_info))
+        os.replace(tmp_file, info_file)
 
-        info["status"] = status
-        info["end_time"] = datetime.now().isoformat()
 
-        with open(info_file, "w") as f:
-            json.dump(info, f, indent=2)
+class TimerLogger:
+    """Workflow timer; step and action hooks are no-ops"""
 
+    def __init__(self):
+        self.start_time = None
 
-class DebugLogger:
+    def start_workflow(self):
+        """Start workflow timer"""
+        self.start_time = time.monotonic()
+
+    def start_step(self, step_name: str, description: str):
+        """Log step start (not recorded)"""
+
+    def log_action(self, action: str, details: str = "", status: str = "info"):
+        """Log an action with status (not recorded)"""
+
+    def end_step(self, success: bool, result_summary: str = ""):
+        """Log step completion (not recorded)"""
+
+    def _get_elapsed(self) -> float:
+        """Get elapsed time since workflow start"""
+        if self.start_time:
+            return time.monotonic() - self.start_time
+        return 0.0
+
+    def get_total_elapsed(self) -> str:
+        """Get formatted total elapsed time"""
+        if not self.start_time:
+            return "00:00:00"
+        minutes, seconds = divmod(int(time.monotonic() - self.start_time), 60)
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+class DebugLogger(TimerLogger):
     """Real-time debug logger for agent actions"""
 
-    def __init__(self):
-        self.actions: List[Dict[str, Any]] = []
-        self.start_time = None
+    def __init__(self, max_actions: int = 256):
+        super().__init__()
+        # Only the most recent actions are kept; action_count is the total
+        self.actions: deque = deque(maxlen=max_actions)
+        # Table rows are formatted once per action, in step with actions
+        self._rows: deque = deque(maxlen=max_actions)
+        # step -> (duration, success) of its latest run, for the summary
+        self.step_timings: Dict[str, tuple] = {}
+        # Running totals over step_timings, kept in step by end_step
+        self.total_step_time = 0.0
+        self.successful_steps = 0
+        # Last format_action_log() table and the action_count it covers
+        self._log_table: Optional[Table] = None
+        self._log_table_count = -1
+        self.action_count = 0
         self.current_step = None
         self.step_start_time = None
 
     def start_workflow(self):
         """Start workflow timer"""
-        self.start_time = time.time()
-        self.actions = []
+        super().start_workflow()
+        self.actions.clear()
+        self._rows.clear()
+        self.step_timings.clear()
+        self.total_step_time = 0.0
+        self.successful_steps = 0
+        self.action_count = 0
+        self._log_table_count = -1
+
+    def _record(self, entry: Dict[str, Any]):
+        """Store an action entry with its timestamps"""
+        entry["timestamp"] = datetime.now().isoformat(timespec="milliseconds")
+        entry["elapsed"] = self._get_elapsed()
+        self.actions.append(entry)
+        self._rows.append(self._format_row(entry))
+        self.action_count += 1
 
     def start_step(self, step_name: str, description: str):
         """Log step start"""
         self.current_step = step_name
-        self.step_start_time = time.time()
-        self.actions.append({
+        self.step_start_time = time.monotonic()
+        self._record({
             "type": "step_start",
             "step": step_name,
             "description": description,
-            "timestamp": datetime.now().isoformat(),
-            "elapsed": self._get_elapsed()
         })
 
     def log_action(self, action: str, details: str = "", status: str = "info"):
         """Log an action with status"""
-        self.actions.append({
+        self._record({
             "type": "action",
             "step": self.current_step,
             "action": action,
             "details": details,
             "status": status,
-            "timestamp": datetime.now().isoformat(),
-            "elapsed": self._get_elapsed()
         })
 
     def end_step(self, success: bool, result_summary: str = ""):
         """Log step completion"""
-        duration = time.time() - self.step_start_time if self.step_start_time else 0
-        self.actions.append({
+        duration = time.monotonic() - self.step_start_time if self.step_start_time else 0
+        # A re-run step replaces its earlier entry in the totals
+        previous = self.step_timings.get(self.current_step)
+        if previous is not None:
+            self.total_step_time -= previous[0]
+            self.successful_steps -= previous[1]
+        self.step_timings[self.current_step] = (duration, success)
+        self.total_step_time += duration
+        self.successful_steps += success
+        self._record({
             "type": "step_end",
             "step": self.current_step,
             "success": success,
             "duration": duration,
             "result_summary": result_summary,
-            "timestamp": datetime.now().isoformat(),
-            "elapsed": self._get_elapsed()
         })
 
-    def _get_elapsed(self) -> float:
-        """Get elapsed time since workflow start"""
-        if self.start_time:
-            return time.time() - self.start_time
-        return 0.0
-
-    def get_total_elapsed(self) -> str:
-        """Get formatted total elapsed time"""
-        if not self.start_time:
-            return "00:00:00"
-        elapsed = time.time() - self.start_time
-        hours = int(elapsed // 3600)
-        minutes = int((elapsed % 3600) // 60)
-        seconds = int(elapsed % 60)
-        return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-
     def format_action_log(self) -> Table:
-        """Format actions as a rich table"""
+        """Format actions as a rich table (reused until an action is added)"""
+        if self._log_table_count == self.action_count:
+            return self._log_table
+
         table = Table(
             title="🔍 Debug Log - Agent Actions",
             box=box.ROUNDED,
@@ -195,38 +466,37 @@ class DebugLogger:
         table.add_column("Status", width=10)
         table.add_column("Duration", style="yellow", width=10)
 
-        for action in self.actions[-20:]:  # Show last 20 actions
-            elapsed = action.get("elapsed", 0)
-            time_str = f"{int(elapsed // 60):02d}:{int(elapsed % 60):02d}"
-
-            if action["type"] == "step_start":
-                step = action["step"]
-                desc = action["description"][:30]
-                table.add_row(time_str, step, desc, "▶️ START", "-")
-
-            elif action["type"] == "action":
-                step = action.get("step", "")
-                act = action["action"]
-                status = action["status"]
-                status_icon = self._get_status_icon(status)
-                table.add_row(time_str, step, act, status_icon, "-")
-
-            elif action["type"] == "step_end":
-                step = action["step"]
-                success = action["success"]
-                duration = action.get("duration", 0)
-                status_icon = "✅ DONE" if success else "❌ FAIL"
-                duration_str = f"{duration:.2f}s"
-                table.add_row(
-                    time_str,
-                    step,
-                    "Completed",
-                    status_icon,
-                    duration_str,
-                    style="bold green" if success else "bold red")
+        # Show last 20 actions without copying the row list
+        recent = itertools.islice(
+            self._rows, max(0, len(self._rows) - 20), None)
+        for cells, style in recent:
+            table.add_row(*cells, style=style)
 
+        self._log_table = table
+        self._log_table_count = self.action_count
         return table
 
+    def _format_row(self, action: Dict[str, Any]):
+        """Build the (cells, style) table row for one action"""
+        elapsed = action.get("elapsed", 0)
+        time_str = f"{int(elapsed // 60):02d}:{int(elapsed % 60):02d}"
+
+        if action["type"] == "step_start":
+            desc = action["description"][:30]
+            return (time_str, action["step"], desc, "▶️ START", "-"), None
+
+        if action["type"] == "action":
+            status_icon = self._get_status_icon(action["status"])
+            return (time_str, action.get("step", ""), action["action"],
+                    status_icon, "-"), None
+
+        success = action["success"]
+        duration = action.get("duration", 0)
+        status_icon = "✅ DONE" if success else "❌ FAIL"
+        return ((time_str, action["step"], "Completed", status_icon,
+                 f"{duration:.2f}s"),
+                "bold green" if success else "bold red")
+
     def _get_status_icon(self, status: str) -> str:
         """Get status icon for action"""
         icons = {
@@ -239,6 +509,7 @@ class DebugLogger:
         return icons.get(status, "ℹ️ INFO")
 
 
+@functools.lru_cache(maxsize=1)
 def auto_detect_provider() -> Optional[str]:
     """Auto-detect which provider is configured.
 
@@ -248,6 +519,8 @@ def auto_detect_provider() -> Optional[str]:
     3. Vertex AI — if GOOGLE_CLOUD_PROJECT is set
     4. Gemini API — if GOOGLE_API_KEY is set
     5. None — if nothing is configured
+
+    The result is cached; the environment does not change during a run.
     """
     import shutil
     # Check Claude Code CLI first (subscription, no API key needed)
@@ -261,27 +534,33 @@ def auto_detect_provider() -> Optional[str]:
         except Exception:
             pass
 
+    env = os.environ
+
     # Check Claude API
-    if os.getenv("ANTHROPIC_API_KEY"):
+    if env.get("ANTHROPIC_API_KEY"):
         return "claude"
 
     # Check Vertex (enterprise)
-    if os.getenv("GOOGLE_CLOUD_PROJECT") or os.getenv("GCP_PROJECT"):
+    if env.get("GOOGLE_CLOUD_PROJECT") or env.get("GCP_PROJECT"):
         return "vertex"
 
     # Check Gemini
-    if os.getenv("GOOGLE_API_KEY"):
+    if env.get("GOOGLE_API_KEY"):
         return "gemini"
 
     return None
 
 
-def check_provider_config(provider: str, api_key: Optional[str] = None):
+def check_provider_config(
+        provider: str,
+        api_key: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None):
     """Check configuration for selected provider.
 
-    Returns (ok, error_msg).
+    env defaults to os.environ. Returns (ok, error_msg).
     """
     import shutil
+    env = os.environ if env is None else env
     provider = provider.lower()
     if provider == "claude-code":
         if shutil.which("claude") is None:
@@ -291,8 +570,7 @@ def check_provider_config(provider: str, api_key: Optional[str] = None):
             )
         return True, None
     if provider == "vertex":
-        project_id = os.getenv(
-            "GOOGLE_CLOUD_PROJECT") or os.getenv("GCP_PROJECT")
+        project_id = env.get("GOOGLE_CLOUD_PROJECT") or env.get("GCP_PROJECT")
         if not project_id:
             return False, (
                 "GOOGLE_CLOUD_PROJECT environment variable not set.\n"
@@ -300,7 +578,7 @@ def check_provider_config(provider: str, api_key: Optional[str] = None):
             )
         return True, None
     if provider == "claude":
-        key = api_key or os.getenv("ANTHROPIC_API_KEY")
+        key = api_key or env.get("ANTHROPIC_API_KEY")
         if not key:
             return False, (
                 "ANTHROPIC_API_KEY environment variable not set.\n"
@@ -308,7 +586,7 @@ def check_provider_config(provider: str, api_key: Optional[str] = None):
             )
         return True, None
     # gemini
-    key = api_key or os.getenv("GOOGLE_API_KEY")
+    key = api_key or env.get("GOOGLE_API_KEY")
     if not key:
         return False, (
             "GOOGLE_API_KEY environment variable not set.\n"
@@ -328,7 +606,11 @@ class LabGenieWorkflow:
             verbose: bool = True,
             provider: Optional[str] = None,
             api_key: Optional[str] = None,
-            config_path: Optional[Path] = None):
+            config_path: Optional[Path] = None,
+            archive: bool = False,
+            inline_manifest: bool = False,
+            md_cache: bool = True,
+            agents_from: Optional["LabGenieWorkflow"] = None):
         """Initialize the workflow with Vertex AI configuration.
 
         Args:
@@ -339,17 +621,31 @@ class LabGenieWorkflow:
             provider: AI provider to use
             api_key: API key for Gemini API
             config_path: Path to config.json file (default: ./config.json)
+            archive: Pack generated files into one tarball instead of a tree
+            inline_manifest: Keep file contents in lab_manifest.json
+            md_cache: Reuse cached step 1 results for previously seen URLs
+            agents_from: Workflow whose agent instances are reused
         """
         self.verbose = verbose
+        self.archive = archive
+        self.inline_manifest = inline_manifest
+        self._md_cache = MarkdownCache() if md_cache else None
+        # Step animations; batch runs turn them off (steps run concurrently)
+        self.animate = True
+
+        # Shared Live display while steps run (see shared_step_display)
+        self._live = None
 
         # Load configuration
         self.config = self._load_config(config_path or Path("config.json"))
 
+        env = os.environ
+
         # Smart provider detection: explicit > env > auto-detect
         if provider:
             self.provider = provider.lower()
-        elif os.getenv("LABGENIE_PROVIDER"):
-            self.provider = os.getenv("LABGENIE_PROVIDER").lower()
+        elif env.get("LABGENIE_PROVIDER"):
+            self.provider = env["LABGENIE_PROVIDER"].lower()
         else:
             # Auto-detect based on what's configured
             detected = auto_detect_provider()
@@ -379,13 +675,14 @@ class LabGenieWorkflow:
                 sys.exit(1)
 
         if self.provider == "claude":
-            self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
+            self.api_key = api_key or env.get("ANTHROPIC_API_KEY")
         elif self.provider == "claude-code":
             self.api_key = None  # no key needed — uses CLI session
         else:
-            self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
+            self.api_key = api_key or env.get("GOOGLE_API_KEY")
 
-        ok, error_msg = check_provider_config(self.provider, self.api_key)
+        ok, error_msg = check_provider_config(
+            self.provider, self.api_key, env)
         if not ok:
             console.print(
                 f"[red]❌ Error: {
@@ -393,35 +690,47 @@ class LabGenieWorkflow:
             console.print(f"[yellow]{error_msg}[/yellow]")
             sys.exit(1)
 
-        # Initialize agents silently with models from config
-        # Support both provider-scoped models and flat model maps
-        all_models = self.config.get("models", {})
-        if self.provider in all_models and isinstance(all_models[self.provider], dict):
-            models = all_models[self.provider]
+        if agents_from is not None:
+            # Batch runs share one set of agents (and their provider models)
+            self.writeup_to_markdown = agents_from.writeup_to_markdown
+            self.writeup_parser = agents_from.writeup_parser
+            self.lab_core_planner = agents_from.lab_core_planner
+            self.lab_builder = agents_from.lab_builder
         else:
-            models = all_models  # flat legacy format
-
-        agents_list = [
-            ("WriteUpToMarkdown", WriteUpToMarkdownAgent, models.get("WriteUpToMarkdown")),
-            ("WriteupParser", WriteupParserAgent, models.get("WriteupParser")),
-            ("LabCorePlanner", LabCorePlannerAgent, models.get("LabCorePlanner")),
-            ("LabBuilder", LabBuilderAgent, models.get("LabBuilder"))
-        ]
-
-        for idx, (_, AgentClass, model) in enumerate(agents_list):
-            agent_instance = AgentClass(
-                api_key=self.api_key,
-                provider=self.provider,
-                model=model)
-
-            if idx == 0:
-                self.writeup_to_markdown = agent_instance
-            elif idx == 1:
-                self.writeup_parser = agent_instance
-            elif idx == 2:
-                self.lab_core_planner = agent_instance
-            elif idx == 3:
-                self.lab_builder = agent_instance
+            from agents.WriteUpToMarkdown.agent import WriteUpToMarkdownAgent
+            from agents.WriteupParser.agent import WriteupParserAgent
+            from agents.LabCorePlanner.agent import LabCorePlannerAgent
+            from agents.LabBuilder.agent import LabBuilderAgent
+
+            # Initialize agents silently with models from config
+            # Support both provider-scoped models and flat model maps
+            all_models = self.config.get("models", {})
+            if self.provider in all_models and isinstance(all_models[self.provider], dict):
+                models = all_models[self.provider]
+            else:
+                models = all_models  # flat legacy format
+
+            agents_list = [
+                ("WriteUpToMarkdown", WriteUpToMarkdownAgent, models.get("WriteUpToMarkdown")),
+                ("WriteupParser", WriteupParserAgent, models.get("WriteupParser")),
+                ("LabCorePlanner", LabCorePlannerAgent, models.get("LabCorePlanner")),
+                ("LabBuilder", LabBuilderAgent, models.get("LabBuilder"))
+            ]
+
+            for idx, (_, AgentClass, model) in enumerate(agents_list):
+                agent_instance = AgentClass(
+                    api_key=self.api_key,
+                    provider=self.provider,
+                    model=model)
+
+                if idx == 0:
+                    self.writeup_to_markdown = agent_instance
+                elif idx == 1:
+                    self.writeup_parser = agent_instance
+                elif idx == 2:
+                    self.lab_core_planner = agent_instance
+                elif idx == 3:
+                    self.lab_builder = agent_instance
 
         self.output_base = output_dir or Path("./output")
         self.output_base.mkdir(exist_ok=True)
@@ -429,12 +738,14 @@ class LabGenieWorkflow:
         self._custom_output = output_dir is not None
 
         self.debug_mode = debug_mode
-        # Always initialize logger for duration tracking
-        self.logger = DebugLogger()
+        # Always initialize logger for duration tracking; outside debug mode
+        # a TimerLogger keeps the timer and ignores step/action hooks
+        self.logger = DebugLogger() if debug_mode else TimerLogger()
 
         self.run_id = datetime.now().strftime("%Y%m%d_%H%M%S") + \
             "_" + str(uuid.uuid4())[:8]
-        self.file_logger = FileLogger(self.run_id, log_dir)
+        self.file_logger = FileLogger(
+            self.run_id, log_dir, pretty=bool(env.get("LABGENIE_PRETTY_LOGS")))
 
         # Store info for later display
         self.provider_info = {
@@ -443,9 +754,9 @@ class LabGenieWorkflow:
             "log_path": str(log_dir or Path("logs"))
         }
         if self.provider == "vertex":
-            self.provider_info["project"] = os.getenv(
-                "GOOGLE_CLOUD_PROJECT") or os.getenv("GCP_PROJECT")
-            self.provider_info["location"] = os.getenv(
+            self.provider_info["project"] = (
+                env.get("GOOGLE_CLOUD_PROJECT") or env.get("GCP_PROJECT"))
+            self.provider_info["location"] = env.get(
                 "GOOGLE_CLOUD_LOCATION", "us-central1")
 
     def _load_config(self, config_path: Path) -> Dict[str, Any]:
@@ -495,8 +806,8 @@ class LabGenieWorkflow:
             return default_config
 
         try:
-            with open(config_path, 'r') as f:
-                config = json.load(f)
+            with open(config_path, 'rb') as f:
+                config = _loads(f.read())
                 # Merge with defaults for any missing values
                 if "models" not in config:
                     config["models"] = default_config["models"]
@@ -536,7 +847,8 @@ class LabGenieWorkflow:
             step_name: str,
             coro,
             description: str,
-            agent_input: Any = None):
+            agent_input: Any = None,
+            received: Optional[Callable[[], int]] = None):
         """Run a workflow step with ANIMATED loading screen and timer"""
         return await execute_step_with_animation(
             step_name=step_name,
@@ -547,17 +859,66 @@ class LabGenieWorkflow:
             file_logger=self.file_logger,
             debug_mode=self.debug_mode,
             verbose=self.verbose,
-            agent_input=agent_input
+            agent_input=agent_input,
+            live=self._live,
+            animate=self.animate,
+            received=received
         )
 
+    @contextlib.contextmanager
+    def shared_step_display(self):
+        """Render consecutive steps in one Live display"""
+        with step_display(console) as live:
+            self._live = live
+            try:
+                yield
+            finally:
+                self._live = None
+
+    def start_warmup(self) -> asyncio.Future:
+        """Start preparing the later agents' provider models in threads.
+
+        The work is submitted immediately, so it proceeds even while the
+        event loop is blocked (e.g. on a prompt). Await the returned future
+        to collect it.
+        """
+        loop = asyncio.get_running_loop()
+        agents = (self.writeup_parser, self.lab_core_planner, self.lab_builder)
+        # Best effort: a failure here resurfaces on the agent's first call
+        return asyncio.gather(
+            *(loop.run_in_executor(None, agent.warmup) for agent in agents),
+            return_exceptions=True)
+
+    async def warmup_provider(self):
+        """Prepare the later agents' provider models off the event loop"""
+        await self.start_warmup()
+
+    async def _convert_cached(self, url: str) -> Dict[str, Any]:
+        """Convert url, reusing a cached result from an earlier run"""
+        cache = self._md_cache
+        if cache is not None:
+            cached = await asyncio.to_thread(cache.get, url)
+            if cached is not None:
+                return cached
+
+        result = await self.writeup_to_markdown.convert(url)
+        if cache is not None and result.get("status") == "ok":
+            await asyncio.to_thread(cache.put, url, result)
+        return result
+
     async def step_1_markdown_conversion(self, url: str) -> Dict[str, Any]:
         """Step 1: Convert write-up URL to markdown"""
-        return await self.run_step_with_genie(
-            "WriteUp to Markdown Conversion",
-            self.writeup_to_markdown.convert(url),
-            "Fetching and converting the vulnerability write-up to structured markdown...",
-            agent_input=url
-        )
+        # Warm up steps 2-4 while the write-up is being fetched
+        warmup = asyncio.create_task(self.warmup_provider())
+        try:
+            return await self.run_step_with_genie(
+                "WriteUp to Markdown Conversion",
+                self._convert_cached(url),
+                "Fetching and converting the vulnerability write-up to structured markdown...",
+                agent_input=url
+            )
+        finally:
+            await warmup
 
     def step_1_from_files(self, file_paths: List[Path]) -> Dict[str, Any]:
         """Step 1 substitute: load local markdown files instead of fetching URL"""
@@ -611,12 +972,25 @@ class LabGenieWorkflow:
     async def step_4_lab_building(
             self, plan_data: Dict[str, Any]) -> Dict[str, Any]:
         """Step 4: Build complete lab artifacts"""
-        return await self.run_step_with_genie(
-            "Lab Building",
-            self.lab_builder.build(plan_data),
-            "Generating complete, runnable lab repository with code, configs, and tests...",
-            agent_input=plan_data
-        )
+        received = 0
+
+        def on_progress(chars: int):
+            nonlocal received
+            received = chars
+
+        # Batch runs share agents and show no animation, so leave it unset
+        if self.animate:
+            self.lab_builder.on_progress = on_progress
+        try:
+            return await self.run_step_with_genie(
+                "Lab Building",
+                self.lab_builder.build(plan_data),
+                "Generating complete, runnable lab repository with code, configs, and tests...",
+                agent_input=plan_data,
+                received=lambda: received
+            )
+        finally:
+            self.lab_builder.on_progress = None
 
     def _extract_lab_name(
             self, lab_data: Dict[str, Any], plan_data: Dict[str, Any]) -> str:
@@ -640,21 +1014,18 @@ class LabGenieWorkflow:
             lab_name = f"vulnerability_lab_{timestamp}"
 
         # Sanitize lab name (remove invalid characters)
-        lab_name = re.sub(r'[^\w\-_]', '_', lab_name)
+        lab_name = _LAB_NAME_SANITIZE.sub('_', lab_name)
 
         return lab_name
 
     def save_artifacts(
             self, lab_data: Dict[str, Any], plan_data: Dict[str, Any]) -> Path:
         """Save lab artifacts to output/{labname} directory"""
-        header = Panel(
-            "[bold white]💾 Saving Lab Artifacts[/bold white]",
-            border_style="cyan",
-            box=box.ROUNDED,
-            padding=(0, 1),
-            width=60
+        from rich.progress import (
+            Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
         )
-        console.print(header)
+
+        console.print(_SAVE_HEADER)
 
         files_list = lab_data.get("files", [])
 
@@ -667,8 +1038,7 @@ class LabGenieWorkflow:
             self.output_dir.mkdir(parents=True, exist_ok=True)
 
             debug_file = self.output_dir / "debug_lab_data.json"
-            with open(debug_file, "w") as f:
-                json.dump(lab_data, f, indent=2)
+            debug_file.write_bytes(_dumps(lab_data))
 
             return self.output_dir
 
@@ -690,13 +1060,7 @@ class LabGenieWorkflow:
         if docker_config.get("docker_compose", {}).get("content"):
             total_tasks += 1
 
-        progress_panel = Panel(
-            "[bold cyan]⏳ Writing files to disk...[/bold cyan]",
-            border_style="cyan",
-            box=box.ROUNDED,
-            width=60
-        )
-        console.print(progress_panel)
+        console.print(_WRITING_PANEL)
 
         with Progress(
             SpinnerColumn(),
@@ -710,38 +1074,77 @@ class LabGenieWorkflow:
             task = progress.add_task(
                 "[cyan]Writing files...", total=total_tasks)
 
-            # Write application files
+            # Encode each file once. Unless the manifest inlines contents,
+            # the text is dropped from lab_data as soon as it is encoded so
+            # only one copy of each file is held, and the manifest records
+            # its hash instead.
+            contents = []
+            manifest_files = []
             for file_info in files_list:
-                file_path = self.output_dir / file_info["path"]
-                file_path.parent.mkdir(parents=True, exist_ok=True)
-
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(file_info.get("content", ""))
-
-                progress.update(task, advance=1)
+                if self.inline_manifest:
+                    data = file_info.get("content", "").encode("utf-8")
+                else:
+                    data = file_info.pop("content", "").encode("utf-8")
+                    manifest_files.append({
+                        **file_info,
+                        "size": len(data),
+                        "sha256": hashlib.sha256(data).hexdigest()
+                    })
+                contents.append((file_info["path"], data))
+
+            if self.archive:
+                archive_path = self._write_archive(
+                    contents, docker_config, progress, task)
+                if self.verbose:
+                    console.print(f"[dim]Archive: {archive_path.name}[/dim]")
+            else:
+                # Write application files: create each directory once, then
+                # write the (independent, I/O-bound) files from a thread pool
+                writes = [
+                    (self.output_dir / rel_path, data)
+                    for rel_path, data in contents
+                ]
+                for parent in {file_path.parent for file_path, _ in writes}:
+                    parent.mkdir(parents=True, exist_ok=True)
+
+                with ThreadPoolExecutor(
+                        max_workers=min(32, len(writes))) as pool:
+                    futures = [
+                        pool.submit(file_path.write_bytes, data)
+                        for file_path, data in writes
+                    ]
+                    for future in as_completed(futures):
+                        future.result()
+                        progress.update(task, advance=1)
 
             # Write Docker configuration files
-            if docker_config:
+            if docker_config and not self.archive:
                 # Write Dockerfile (always required)
                 dockerfile = docker_config.get("dockerfile", {})
                 if dockerfile.get("content"):
                     dockerfile_path = self.output_dir / "Dockerfile"
-                    with open(dockerfile_path, "w", encoding="utf-8") as f:
-                        f.write(dockerfile["content"])
+                    dockerfile_path.write_bytes(
+                        dockerfile["content"].encode("utf-8"))
                     progress.update(task, advance=1)
 
                 docker_compose = docker_config.get("docker_compose", {})
                 if docker_compose.get("content") and docker_compose["content"] not in [
                         None, "null", ""]:
                     compose_path = self.output_dir / "docker-compose.yml"
-                    with open(compose_path, "w", encoding="utf-8") as f:
-                        f.write(docker_compose["content"])
+                    compose_path.write_bytes(
+                        docker_compose["content"].encode("utf-8"))
                     progress.update(task, advance=1)
 
-        # Save complete JSON output
+        # Save JSON manifest (file contents only with --inline-manifest)
+        manifest = lab_data
+        if not self.inline_manifest:
+            manifest = {
+                **lab_data,
+                "files": manifest_files,
+                "docker_config": self._docker_config_metadata(docker_config)
+            }
         output_json = self.output_dir / "lab_manifest.json"
-        with open(output_json, "w", encoding="utf-8") as f:
-            json.dump(lab_data, f, indent=2)
+        output_json.write_bytes(_dumps(manifest))
 
         success_msg = Panel(
             f"[bold green]✅ All artifacts saved![/bold green]\n"
@@ -754,6 +1157,63 @@ class LabGenieWorkflow:
         console.print(success_msg)
         return self.output_dir
 
+    @staticmethod
+    def _docker_config_metadata(docker_config: Dict[str, Any]) -> Dict[str, Any]:
+        """docker_config with each file's content replaced by its size"""
+        metadata = {}
+        for key, value in docker_config.items():
+            if isinstance(value, dict) and isinstance(value.get("content"), str):
+                size = len(value["content"].encode("utf-8"))
+                value = {k: v for k, v in value.items() if k != "content"}
+                value["size"] = size
+            metadata[key] = value
+        return metadata
+
+    def _write_archive(
+            self,
+            contents: List[tuple],
+            docker_config: Dict[str, Any],
+            progress: "Progress",
+            task) -> Path:
+        """Stream lab files and Docker configs into one compressed tarball.
+
+        Uses lab.tar.zst when the zstandard package is installed, otherwise
+        lab.tar.gz. Returns the archive path.
+        """
+        entries = list(contents)
+        dockerfile = docker_config.get("dockerfile", {})
+        if dockerfile.get("content"):
+            entries.append(
+                ("Dockerfile", dockerfile["content"].encode("utf-8")))
+        docker_compose = docker_config.get("docker_compose", {})
+        if docker_compose.get("content") not in [None, "null", ""]:
+            entries.append(
+                ("docker-compose.yml",
+                 docker_compose["content"].encode("utf-8")))
+
+        mtime = time.time()
+
+        def add_entries(tar: tarfile.TarFile):
+            for rel_path, data in entries:
+                info = tarfile.TarInfo(rel_path)
+                info.size = len(data)
+                info.mtime = mtime
+                info.mode = 0o644
+                tar.addfile(info, io.BytesIO(data))
+                progress.update(task, advance=1)
+
+        if zstandard is not None:
+            archive_path = self.output_dir / "lab.tar.zst"
+            with open(archive_path, "wb") as raw, \
+                    zstandard.ZstdCompressor().stream_writer(raw) as stream, \
+                    tarfile.open(fileobj=stream, mode="w|") as tar:
+                add_entries(tar)
+        else:
+            archive_path = self.output_dir / "lab.tar.gz"
+            with tarfile.open(archive_path, "w:gz") as tar:
+                add_entries(tar)
+        return archive_path
+
     def display_summary(self, lab_data: Dict[str, Any], output_path: Path):
         """Display EPIC workflow completion summary"""
 
@@ -793,8 +1253,6 @@ class LabGenieWorkflow:
                     None, "null", ""]:
                 table.add_row("🐳 Compose", "✅ docker-compose.yml")
 
-        console.print(table)
-
         # Next steps - compact version
         has_compose = docker_config.get("docker_compose", {}).get(
             "content") not in [None, "null", ""]
@@ -819,7 +1277,7 @@ class LabGenieWorkflow:
             padding=(0, 1),
             width=60
         )
-        console.print(next_steps)
+        console.print(Group(table, next_steps))
 
     # -----------------------------------------------------------------
     # Resume helpers
@@ -853,11 +1311,17 @@ class LabGenieWorkflow:
             return None
         try:
             content = log_file.read_text(encoding="utf-8")
-            # Each log entry is separated by ===... lines; take the last one
-            entries = [b.strip() for b in content.split("=" * 80) if b.strip()]
+            separator = "=" * 80
+            if content.lstrip().startswith(separator):
+                # Pretty logs: entries are separated by ===... lines
+                entries = [b.strip() for b in content.split(separator) if b.strip()]
+            else:
+                # JSONL: one entry per line (split on \n only; splitlines()
+                # would also break on U+2028 inside JSON strings)
+                entries = [line for line in content.split("\n") if line.strip()]
             if not entries:
                 return None
-            last = json.loads(entries[-1])
+            last = _loads(entries[-1])
             resp = last.get("response")
             if isinstance(resp, dict) and not resp.get("error"):
                 return resp
@@ -881,11 +1345,7 @@ class LabGenieWorkflow:
         resume_from, cached = self.detect_resume_point(log_dir)
 
         if resume_from is None:
-            console.print(Panel(
-                "[bold green]✅ All steps already completed in that run![/bold green]\n"
-                "[dim]Nothing to resume — use --file or --url for a fresh run.[/dim]",
-                border_style="green", box=box.ROUNDED, padding=(0, 1), width=60
-            ))
+            console.print(_NOTHING_TO_RESUME_PANEL)
             return
 
         console.print(Panel(
@@ -899,26 +1359,27 @@ class LabGenieWorkflow:
 
         try:
             # Determine starting data for each step based on what's cached
-            if resume_from == "markdown":
-                if files:
-                    markdown_data = self.step_1_from_files(files)
+            with self.shared_step_display():
+                if resume_from == "markdown":
+                    if files:
+                        markdown_data = self.step_1_from_files(files)
+                    else:
+                        console.print("[red]❌ No cached markdown and no --file provided; cannot resume from step 1.[/red]")
+                        return
                 else:
-                    console.print("[red]❌ No cached markdown and no --file provided; cannot resume from step 1.[/red]")
-                    return
-            else:
-                markdown_data = cached["markdown"]
+                    markdown_data = cached["markdown"]
 
-            if resume_from in ("markdown", "parser"):
-                vulnerability_data = await self.step_2_vulnerability_parsing(markdown_data)
-            else:
-                vulnerability_data = cached["parser"]
+                if resume_from in ("markdown", "parser"):
+                    vulnerability_data = await self.step_2_vulnerability_parsing(markdown_data)
+                else:
+                    vulnerability_data = cached["parser"]
 
-            if resume_from in ("markdown", "parser", "planner"):
-                plan_data = await self.step_3_lab_planning(vulnerability_data)
-            else:
-                plan_data = cached["planner"]
+                if resume_from in ("markdown", "parser", "planner"):
+                    plan_data = await self.step_3_lab_planning(vulnerability_data)
+                else:
+                    plan_data = cached["planner"]
 
-            lab_data = await self.step_4_lab_building(plan_data)
+                lab_data = await self.step_4_lab_building(plan_data)
 
             output_path = self.save_artifacts(lab_data, plan_data)
             self.file_logger.finalize("success")
@@ -941,35 +1402,24 @@ class LabGenieWorkflow:
 
     async def run_interactive(self):
         """Run the interactive CLI workflow"""
-        self.display_banner()
+        from rich.prompt import Prompt
 
-        if self.debug_mode:
-            console.print(Panel(
-                "[bold green]🔍 Debug Mode: ENABLED[/bold green]",
-                border_style="green",
-                box=box.ROUNDED,
-                padding=(0, 1),
-                width=60
-            ))
+        self.display_banner()
 
         # Input prompt panel — ask for URL or local files
-        console.print(
-            Panel(
-                "[bold white]Vulnerability Write-up Source[/bold white]\n"
-                "[dim]Enter a URL  [bold]or[/bold]  one/more local markdown file paths (space-separated)[/dim]",
-                border_style="cyan",
-                box=box.ROUNDED,
-                padding=(0, 1),
-                width=60
-            ))
+        if self.debug_mode:
+            console.print(Group(_DEBUG_ENABLED_PANEL, _INPUT_PROMPT_PANEL))
+        else:
+            console.print(_INPUT_PROMPT_PANEL)
 
+        # Warm up while the user types. Prompt.ask stays on the main thread
+        # (Ctrl-C must reach it); the warm-up runs in worker threads anyway.
+        warmup = self.start_warmup()
         raw_input = Prompt.ask("🔗 [cyan]URL or file path(s)[/cyan]")
+        await warmup
 
         if not raw_input:
-            console.print(Panel(
-                "[red]❌ Input is required[/red]",
-                border_style="red", box=box.ROUNDED, padding=(0, 1), width=60
-            ))
+            console.print(_INPUT_REQUIRED_PANEL)
             return
 
         # Detect local files vs URL
@@ -981,33 +1431,47 @@ class LabGenieWorkflow:
             url = raw_input.strip()
             if self.verbose:
                 console.print(Panel(
-                    f"[dim]Processing: {url}[/dim]",
+                    Text(f"Processing: {url}", style="dim"),
                     border_style="blue", box=box.ROUNDED, padding=(0, 1), width=60
                 ))
 
+        await self.run_workflow(
+            url=None if use_files else url,
+            files=local_files if use_files else None)
+
+    async def run_workflow(
+            self,
+            url: Optional[str] = None,
+            files: Optional[List[Path]] = None):
+        """Run steps 1-4 for a URL or local files, then save and summarize.
+
+        Exits the process with status 1 if a step raises, or 0 on Ctrl-C.
+        """
         # Always start workflow timer (needed for duration tracking)
         if self.logger:
             self.logger.start_workflow()
 
         try:
-            if use_files:
-                markdown_data = self.step_1_from_files(local_files)
-            else:
-                markdown_data = await self.step_1_markdown_conversion(url)
+            with self.shared_step_display():
+                if files:
+                    markdown_data = self.step_1_from_files(files)
+                else:
+                    markdown_data = await self.step_1_markdown_conversion(url)
+
+                if markdown_data.get("error"):
+                    self.file_logger.finalize("failed")
+                    console.print(
+                        f"[bold red]❌ Error: {
+                            markdown_data.get(
+                                'reason',
+                                'Invalid URL')}[/bold red]")
+                    if self.debug_mode and self.logger:
+                        self._display_debug_summary()
+                    return
 
-            if markdown_data.get("error"):
-                console.print(
-                    f"[bold red]❌ Error: {
-                        markdown_data.get(
-                            'reason',
-                            'Invalid URL')}[/bold red]")
-                if self.debug_mode and self.logger:
-                    self._display_debug_summary()
-                return
-
-            vulnerability_data = await self.step_2_vulnerability_parsing(markdown_data)
-            plan_data = await self.step_3_lab_planning(vulnerability_data)
-            lab_data = await self.step_4_lab_building(plan_data)
+                vulnerability_data = await self.step_2_vulnerability_parsing(markdown_data)
+                plan_data = await self.step_3_lab_planning(vulnerability_data)
+                lab_data = await self.step_4_lab_building(plan_data)
 
             output_path = self.save_artifacts(lab_data, plan_data)
             self.file_logger.finalize("success")
@@ -1033,17 +1497,19 @@ class LabGenieWorkflow:
 
     def _display_debug_summary(self):
         """Display comprehensive debug summary"""
-        if not self.logger:
+        # Only a DebugLogger records the actions and timings shown here
+        if not isinstance(self.logger, DebugLogger):
             return
 
-        console.print("\n" + "=" * 70)
-        console.print(
-            "[bold cyan]📊 Debug Summary - Workflow Analysis[/bold cyan]")
-        console.print("=" * 70 + "\n")
-
-        # Display action log table
-        console.print(self.logger.format_action_log())
-        console.print()
+        # Collect every section and write the summary with a single print
+        items = [
+            "\n" + "=" * 70,
+            "[bold cyan]📊 Debug Summary - Workflow Analysis[/bold cyan]",
+            "=" * 70 + "\n",
+            # Action log table
+            self.logger.format_action_log(),
+            "",
+        ]
 
         # Display timing summary
         timing_table = Table(
@@ -1055,81 +1521,55 @@ class LabGenieWorkflow:
         timing_table.add_column("Duration", style="yellow", justify="right")
         timing_table.add_column("Status", justify="center")
 
-        step_timings = {}
-        for action in self.logger.actions:
-            if action["type"] == "step_end":
-                step = action["step"]
-                duration = action.get("duration", 0)
-                success = action.get("success", False)
-                step_timings[step] = {"duration": duration, "success": success}
-
-        total_time = 0
-        for step, data in step_timings.items():
-            duration = data["duration"]
-            success = data["success"]
-            status = "✅" if success else "❌"
-            timing_table.add_row(step, f"{duration:.2f}s", status)
-            total_time += duration
-
-        timing_table.add_row("[bold]TOTAL", f"[bold]{total_time:.2f}s", "")
-        console.print(timing_table)
-        console.print()
+        # Timings are collected by end_step, so no scan of the action log
+        step_timings = self.logger.step_timings
+        total_time = self.logger.total_step_time
+        rows = [
+            (step, f"{duration:.2f}s", "✅" if success else "❌")
+            for step, (duration, success) in step_timings.items()
+        ]
+        rows.append(("[bold]TOTAL", f"[bold]{total_time:.2f}s", ""))
+        for row in rows:
+            timing_table.add_row(*row)
+        items += [timing_table, ""]
 
         # Display correctness metrics
         total_steps = len(step_timings)
-        successful_steps = sum(
-            1 for data in step_timings.values() if data["success"])
+        successful_steps = self.logger.successful_steps
         success_rate = (
             successful_steps /
             total_steps *
             100) if total_steps > 0 else 0
 
-        metrics_panel = Panel(
-            f"[bold]Workflow Metrics:[/bold]\n\n"
-            f"✅ Successful Steps: {successful_steps}/{total_steps}\n"
+        # Plain Text with styled spans: no markup to parse at render time
+        metrics = Text("Workflow Metrics:", style="bold")
+        metrics.append(
+            f"\n\n✅ Successful Steps: {successful_steps}/{total_steps}\n"
             f"📊 Success Rate: {success_rate:.1f}%\n"
             f"⏱️  Total Duration: {self.logger.get_total_elapsed()}\n"
-            f"🔄 Total Actions Logged: {len(self.logger.actions)}",
+            f"🔄 Total Actions Logged: {self.logger.action_count}")
+        metrics_panel = Panel(
+            metrics,
             title="📈 Performance Metrics",
             border_style="green" if success_rate == 100 else "yellow",
             width=60
         )
-        console.print(metrics_panel)
-        console.print()
+        items += [metrics_panel, ""]
+        console.print(Group(*items))
 
 
 def run_wizard():
     """Run interactive configuration wizard"""
-    # Wizard header
-    wizard_header = Panel(
-        "[bold cyan]🧙 LabGenie Configuration Wizard[/bold cyan]",
-        border_style="cyan",
-        box=box.DOUBLE_EDGE,
-        padding=(0, 1),
-        width=60
-    )
-    console.print(wizard_header)
-    console.print()
+    from rich.prompt import Prompt, Confirm
+
+    console.print(Group(_WIZARD_HEADER, ""))
 
     # Get URL
-    step1_panel = Panel(
-        "[bold white]Step 1: Vulnerability Write-up[/bold white]",
-        border_style="cyan",
-        box=box.ROUNDED,
-        width=60
-    )
-    console.print(step1_panel)
+    console.print(_WIZARD_STEP1_PANEL)
     url = Prompt.ask("🔗 [cyan]Enter the write-up URL[/cyan]")
 
     # Output directory
-    console.print()
-    step2_panel = Panel(
-        "[bold white]Step 2: Output Configuration[/bold white]",
-        border_style="cyan",
-        box=box.ROUNDED,
-        width=60
-    )
-    console.print(step2_panel)
+    console.print(Group("", _WIZARD_STEP2_PANEL))
     use_custom_output = Confirm.ask(
         "📁 Use custom output directory?", default=False)
     output_dir = None
@@ -1145,27 +1585,11 @@ def run_wizard():
         log_dir = Path(Prompt.ask("Logs directory", default="./logs"))
 
     # Debug mode
-    console.print()
-    step3_panel = Panel(
-        "[bold white]Step 3: Runtime Options[/bold white]",
-        border_style="cyan",
-        box=box.ROUNDED,
-        width=60
-    )
-    console.print(step3_panel)
+    console.print(Group("", _WIZARD_STEP3_PANEL))
     debug_mode = Confirm.ask("🔍 Enable debug mode?", default=False)
     verbose = Confirm.ask("📝 Enable verbose output?", default=True)
 
-    console.print()
-    complete_panel = Panel(
-        "[bold green]✓ Configuration complete![/bold green]",
-        border_style="green",
-        box=box.ROUNDED,
-        padding=(0, 1),
-        width=60
-    )
-    console.print(complete_panel)
-    console.print()
+    console.print(Group("", _WIZARD_COMPLETE_PANEL, ""))
 
     return {
         'url': url,
@@ -1176,8 +1600,89 @@ def run_wizard():
     }
 
 
-async def main():
-    """Main entry point for LabGenie CLI"""
+async def run_batch(
+        urls: List[str],
+        concurrency: int = 4,
+        **workflow_kwargs) -> List[tuple]:
+    """Run the full workflow for many URLs, at most `concurrency` at once.
+
+    Every run gets its own workflow (run id, logs, output dir) but they
+    share the first run's agents. Step animations and per-run summaries are
+    skipped; one results table is printed at the end.
+
+    Returns:
+        One (url, output_path or None, error or None) tuple per URL
+    """
+    from agents import WriteUpToMarkdownAgent, stage_failed
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    shared: Dict[str, LabGenieWorkflow] = {}
+
+    async def run_one(url: str) -> tuple:
+        async with semaphore:
+            workflow: Optional[LabGenieWorkflow] = None
+
+            def failed(data: Any, default: str) -> tuple:
+                workflow.file_logger.finalize("failed")
+                reason = data.get("reason") or data.get("error")
+                return url, None, reason if isinstance(reason, str) else default
+
+            try:
+                # Inside the try: a config error (which exits) fails this
+                # URL instead of the whole batch
+                workflow = LabGenieWorkflow(
+                    agents_from=shared.get("agents"), **workflow_kwargs)
+                shared.setdefault("agents", workflow)
+                workflow.animate = False
+                workflow.logger.start_workflow()
+
+                markdown_data = await workflow.step_1_markdown_conversion(url)
+                if stage_failed(markdown_data):
+                    return failed(markdown_data, "Invalid URL")
+                vulnerability_data = await workflow.step_2_vulnerability_parsing(markdown_data)
+                if stage_failed(vulnerability_data):
+                    return failed(vulnerability_data, "Parsing failed")
+                plan_data = await workflow.step_3_lab_planning(vulnerability_data)
+                if stage_failed(plan_data):
+                    return failed(plan_data, "Planning failed")
+                lab_data = await workflow.step_4_lab_building(plan_data)
+                if stage_failed(lab_data):
+                    return failed(lab_data, "Lab building failed")
+                output_path = workflow.save_artifacts(lab_data, plan_data)
+                workflow.file_logger.finalize("success")
+                return url, output_path, None
+            except SystemExit:
+                # The constructor already printed why
+                return url, None, "Workflow setup failed"
+            except Exception as e:
+                if workflow is not None:
+                    workflow.file_logger.finalize("failed")
+                return url, None, str(e)
+
+    try:
+        results = await asyncio.gather(*(run_one(url) for url in urls))
+    finally:
+        await WriteUpToMarkdownAgent.aclose_client()
+
+    table = Table(
+        title=f"📦 Batch Results ({len(urls)} URLs)",
+        box=box.ROUNDED,
+        show_header=True,
+        header_style="bold cyan")
+    table.add_column("URL", style="cyan", overflow="fold")
+    table.add_column("Result")
+    for url, output_path, error in results:
+        if error is None:
+            table.add_row(url, f"[green]✅ {output_path}[/green]")
+        else:
+            table.add_row(url, f"[red]❌ {escape(error)}[/red]")
+    console.print(table)
+    return results
+
+
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser (once per process)"""
     parser = argparse.ArgumentParser(
         prog='labgenie',
         description='LabGenie - Automated Vulnerability Lab Generator',
@@ -1194,6 +1699,9 @@ Examples:
   labgenie --file writeup.md
   labgenie --file part1.md part2.md
 
+  # Batch mode: every URL in a file, 4 workflows at a time
+  labgenie --urls writeups.txt --concurrency 4
+
   # Resume a failed run (auto-detects last successful step)
   labgenie --resume 20260620_224245_d7d94b89
   labgenie --resume ./logs/20260620_224245_d7d94b89
@@ -1220,6 +1728,20 @@ For more information, visit: https://github.com/yourusername/LabGenie
         help='Vulnerability write-up URL to process'
     )
 
+    parser.add_argument(
+        '--urls',
+        type=str,
+        metavar='FILE',
+        help='Process every URL in FILE (one per line, # for comments) concurrently'
+    )
+
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=4,
+        help='Max workflows running at once with --urls (default: 4)'
+    )
+
     parser.add_argument(
         '--file', '-f',
         type=str,
@@ -1278,13 +1800,43 @@ For more information, visit: https://github.com/yourusername/LabGenie
         help='Run interactive configuration wizard'
     )
 
+    parser.add_argument(
+        '--archive',
+        action='store_true',
+        help='Write generated lab files into one lab.tar.zst (or lab.tar.gz) archive'
+    )
+
+    parser.add_argument(
+        '--inline-manifest', '--full-manifest',
+        action='store_true',
+        dest='inline_manifest',
+        help='Include every file\'s content in lab_manifest.json (default: paths, sizes and hashes)'
+    )
+
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always fetch and convert the write-up, ignoring ~/.cache/labgenie/md'
+    )
+
+    parser.add_argument(
+        '--no-uvloop',
+        action='store_true',
+        help='Use the default asyncio event loop even if uvloop is installed'
+    )
+
     parser.add_argument(
         '--version', '-v',
         action='version',
         version='LabGenie v1.0.0'
     )
 
-    args = parser.parse_args()
+    return parser
+
+
+async def main():
+    """Main entry point for LabGenie CLI"""
+    args = _build_parser().parse_args()
 
     # Wizard mode
     if args.wizard:
@@ -1301,47 +1853,15 @@ For more information, visit: https://github.com/yourusername/LabGenie
         workflow.display_banner()
 
         processing_panel = Panel(
-            f"[dim]Processing URL: {config['url']}[/dim]",
+            Text(f"Processing URL: {config['url']}", style="dim"),
             border_style="blue",
             box=box.ROUNDED,
             padding=(0, 1),
             width=60
         )
-        console.print(processing_panel)
-        console.print()
-
-        # Always start workflow timer
-        if workflow.logger:
-            workflow.logger.start_workflow()
-
-        try:
-            markdown_data = await workflow.step_1_markdown_conversion(config['url'])
-
-            if markdown_data.get("error"):
-                console.print(
-                    f"[bold red]❌ Error: {
-                        markdown_data.get(
-                            'reason',
-                            'Invalid URL')}[/bold red]")
-                return
-
-            vulnerability_data = await workflow.step_2_vulnerability_parsing(markdown_data)
-            plan_data = await workflow.step_3_lab_planning(vulnerability_data)
-            lab_data = await workflow.step_4_lab_building(plan_data)
-
-            output_path = workflow.save_artifacts(lab_data, plan_data)
-            workflow.file_logger.finalize("success")
-
-            if workflow.debug_mode and workflow.logger:
-                workflow._display_debug_summary()
-
-            workflow.display_summary(lab_data, output_path)
-
-        except Exception as e:
-            workflow.file_logger.finalize("failed")
-            console.print(f"\n[bold red]❌ Workflow failed: {e}[/bold red]")
-            sys.exit(1)
+        console.print(Group(processing_panel, ""))
 
+        await workflow.run_workflow(url=config['url'])
         return
 
     # Build shared workflow kwargs
@@ -1349,6 +1869,40 @@ For more information, visit: https://github.com/yourusername/LabGenie
     log_dir = Path(args.logs) if args.logs else None
     verbose = not args.quiet
 
+    # --urls batch mode
+    if args.urls:
+        urls_file = Path(args.urls)
+        if not urls_file.exists():
+            console.print(f"[red]❌ File not found: {urls_file}[/red]")
+            sys.exit(1)
+        urls = [
+            line.strip() for line in urls_file.read_text(encoding="utf-8").splitlines()
+            if line.strip() and not line.lstrip().startswith("#")
+        ]
+        if not urls:
+            console.print(f"[red]❌ No URLs in {urls_file}[/red]")
+            sys.exit(1)
+
+        console.print(create_epic_startup_banner())
+        console.print(f"[bold cyan]🤖 Processing {len(urls)} URLs "
+                      f"({args.concurrency} at a time)...[/bold cyan]")
+        results = await run_batch(
+            urls,
+            concurrency=args.concurrency,
+            output_dir=output_dir,
+            log_dir=log_dir,
+            debug_mode=args.debug,
+            verbose=verbose,
+            provider=args.provider,
+            api_key=args.api_key,
+            archive=args.archive,
+            inline_manifest=args.inline_manifest,
+            md_cache=not args.no_cache
+        )
+        if any(error is not None for _, _, error in results):
+            sys.exit(1)
+        return
+
     # --resume mode
     if args.resume:
         workflow = LabGenieWorkflow(
@@ -1357,7 +1911,10 @@ For more information, visit: https://github.com/yourusername/LabGenie
             debug_mode=args.debug,
             verbose=verbose,
             provider=args.provider,
-            api_key=args.api_key
+            api_key=args.api_key,
+            archive=args.archive,
+            inline_manifest=args.inline_manifest,
+            md_cache=not args.no_cache
         )
         workflow.display_banner()
 
@@ -1391,34 +1948,14 @@ For more information, visit: https://github.com/yourusername/LabGenie
             debug_mode=args.debug,
             verbose=verbose,
             provider=args.provider,
-            api_key=args.api_key
+            api_key=args.api_key,
+            archive=args.archive,
+            inline_manifest=args.inline_manifest,
+            md_cache=not args.no_cache
         )
         workflow.display_banner()
 
-        if workflow.logger:
-            workflow.logger.start_workflow()
-
-        try:
-            markdown_data = workflow.step_1_from_files(local_files)
-            vulnerability_data = await workflow.step_2_vulnerability_parsing(markdown_data)
-            plan_data = await workflow.step_3_lab_planning(vulnerability_data)
-            lab_data = await workflow.step_4_lab_building(plan_data)
-
-            output_path = workflow.save_artifacts(lab_data, plan_data)
-            workflow.file_logger.finalize("success")
-
-            if workflow.debug_mode and workflow.logger:
-                workflow._display_debug_summary()
-
-            workflow.display_summary(lab_data, output_path)
-
-        except Exception as e:
-            workflow.file_logger.finalize("failed")
-            console.print(f"\n[bold red]❌ Workflow failed: {e}[/bold red]")
-            if args.debug:
-                console.print(traceback.format_exc())
-            sys.exit(1)
-
+        await workflow.run_workflow(files=local_files)
         return
 
     # --url mode
@@ -1429,50 +1966,19 @@ For more information, visit: https://github.com/yourusername/LabGenie
             debug_mode=args.debug,
             verbose=verbose,
             provider=args.provider,
-            api_key=args.api_key
+            api_key=args.api_key,
+            archive=args.archive,
+            inline_manifest=args.inline_manifest,
+            md_cache=not args.no_cache
         )
         workflow.display_banner()
 
         if workflow.debug_mode:
-            console.print(Panel(
-                "[bold yellow]🐞 Debug Mode Enabled[/bold yellow]",
-                border_style="yellow", box=box.ROUNDED, padding=(0, 1), width=60
-            ))
-
-        console.print(Panel(
-            "[bold cyan]🤖 Processing input...[/bold cyan]",
-            border_style="cyan", box=box.ROUNDED, padding=(0, 1), width=60
-        ))
-
-        if workflow.logger:
-            workflow.logger.start_workflow()
-
-        try:
-            markdown_data = await workflow.step_1_markdown_conversion(args.url)
-
-            if markdown_data.get("error"):
-                console.print(
-                    f"[bold red]❌ Error: {markdown_data.get('reason', 'Invalid URL')}[/bold red]")
-                return
-
-            vulnerability_data = await workflow.step_2_vulnerability_parsing(markdown_data)
-            plan_data = await workflow.step_3_lab_planning(vulnerability_data)
-            lab_data = await workflow.step_4_lab_building(plan_data)
-
-            output_path = workflow.save_artifacts(lab_data, plan_data)
-            workflow.file_logger.finalize("success")
-
-            if workflow.debug_mode and workflow.logger:
-                workflow._display_debug_summary()
-
-            workflow.display_summary(lab_data, output_path)
+            console.print(Group(_CLI_DEBUG_PANEL, _CLI_PROCESSING_PANEL))
+        else:
+            console.print(_CLI_PROCESSING_PANEL)
 
-        except Exception as e:
-            workflow.file_logger.finalize("failed")
-            console.print(f"\n[bold red]❌ Workflow failed: {e}[/bold red]")
-            if args.debug:
-                console.print(traceback.format_exc())
-            sys.exit(1)
+        await workflow.run_workflow(url=args.url)
 
     else:
         # Interactive mode (default)
@@ -1480,9 +1986,22 @@ For more information, visit: https://github.com/yourusername/LabGenie
         await workflow.run_interactive()
 
 
+async def run_cli():
+    """Run main() and release shared network clients on exit"""
+    try:
+        await main()
+    finally:
+        # Only if a workflow actually loaded the agent (and its client)
+        agent_module = sys.modules.get("agents.WriteUpToMarkdown.agent")
+        if agent_module is not None:
+            await agent_module.WriteUpToMarkdownAgent.aclose_client()
+
+
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        # Checked before argparse runs, since the loop is chosen up front
+        run_with_fast_loop(
+            run_cli(), use_uvloop="--no-uvloop" not in sys.argv)
     except KeyboardInterrupt:
         console.print("\n[yellow]Goodbye! 👋[/yellow]")
         sys.exit(0)
@@ -0,0 +1,29 @@
+import asyncio
+import time
+import weakref
+
+import pytest
+
+from agents import base_agent
+from agents.base_agent import BaseAgent
+
+
+async def _contend():
+    return await asyncio.gather(
+        *(BaseAgent._run_blocking(lambda: time.sleep(0.01)) for _ in range(3)))
+
+
+def test_llm_semaphore_survives_a_new_event_loop(monkeypatch):
+    monkeypatch.setattr(base_agent, "_LLM_CONCURRENCY", 1)
+    monkeypatch.setattr(base_agent, "_LLM_SEMAPHORES", weakref.WeakKeyDictionary())
+
+    assert asyncio.run(_contend()) == [None, None, None]
+    assert asyncio.run(_contend()) == [None, None, None]
+
+
+def test_parse_json_response_rejects_truncated_output():
+    truncated = '{"status": "ok", "files": [{"path": "app.py", "content": "print('
+    with pytest.raises(ValueError):
+        BaseAgent.parse_json_response(truncated)
+    with pytest.raises(ValueError):
+        BaseAgent.parse_json_response('{"items": [1, 2')
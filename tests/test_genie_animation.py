@@ -0,0 +1,28 @@
+import asyncio
+
+import rich.live
+from rich.console import Console
+
+from helpers.genie_animation import execute_step_with_animation
+
+
+class _NoLive:
+    def __init__(self, *args, **kwargs):
+        raise AssertionError("Live built with animate=False")
+
+
+async def _work():
+    await asyncio.sleep(0)
+    return {"status": "ok"}
+
+
+def test_animate_false_never_builds_live(monkeypatch):
+    monkeypatch.setattr(rich.live, "Live", _NoLive)
+    monkeypatch.delenv("LABGENIE_NO_ANIM", raising=False)
+    console = Console(force_terminal=True)
+    assert console.is_terminal
+
+    result = asyncio.run(execute_step_with_animation(
+        "Step", _work(), "testing", console, animate=False))
+
+    assert result == {"status": "ok"}
@@ -0,0 +1,44 @@
+import asyncio
+import itertools
+from pathlib import Path
+from types import SimpleNamespace
+
+import labgenie
+
+
+class _FakeWorkflow:
+    """Stands in for LabGenieWorkflow; the second one fails to configure"""
+    created = itertools.count()
+
+    def __init__(self, agents_from=None, **kwargs):
+        if next(self.created) == 1:
+            raise SystemExit(1)
+        self.animate = True
+        self.logger = SimpleNamespace(start_workflow=lambda: None)
+        self.file_logger = SimpleNamespace(finalize=lambda status: None)
+
+    async def step_1_markdown_conversion(self, url):
+        return {"status": "ok", "url": url}
+
+    async def step_2_vulnerability_parsing(self, data):
+        return {"status": "partial"}
+
+    async def step_3_lab_planning(self, data):
+        return {"status": "ok"}
+
+    async def step_4_lab_building(self, data):
+        return {"status": "ok", "lab_name": "demo"}
+
+    def save_artifacts(self, lab_data, plan_data):
+        return Path("output") / lab_data["lab_name"]
+
+
+def test_run_batch_survives_a_failing_workflow(monkeypatch):
+    monkeypatch.setattr(labgenie, "LabGenieWorkflow", _FakeWorkflow)
+
+    results = asyncio.run(labgenie.run_batch(
+        ["https://a", "https://b", "https://c"], concurrency=1))
+
+    assert [url for url, _, _ in results] == ["https://a", "https://b", "https://c"]
+    assert results[0][2] is None and results[2][2] is None
+    assert results[1][1] is None and results[1][2]